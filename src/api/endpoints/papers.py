@@ -4,7 +4,10 @@ Paper upload and management endpoints
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Query
 from typing import List, Optional
+import asyncio
+import itertools
 import uuid
+import aiofiles
 from datetime import datetime
 from pathlib import Path
 
@@ -12,8 +15,27 @@ from src.api.models.base import Paper, PaperListResponse, PaperUpload
 
 router = APIRouter()
 
+# Upload copy chunk size; bounds per-upload memory
+UPLOAD_CHUNK_SIZE = 1 << 16
+
 # In-memory storage for demo (would use database in production)
 papers_db = {}
+# Papers per upload session, in upload order
+session_papers = {}
+
+
+def _store_paper(paper: Paper):
+    """Index a paper by id and by session."""
+    papers_db[paper.id] = paper
+    session_papers.setdefault(paper.session_id, []).append(paper)
+
+
+def _safe_filename(filename: str) -> str:
+    """Strip directory components from a client-supplied filename."""
+    name = Path(filename.replace("\\", "/")).name
+    if name in ("", ".", "..", ".pdf"):
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    return name
 
 
 @router.post("/upload")
@@ -30,25 +52,33 @@ async def upload_papers(
         if file.filename.endswith('.pdf'):
             paper_id = str(uuid.uuid4())
             
-            # Create upload directory
+            # Client filenames are untrusted; keep only the final component
+            filename = _safe_filename(file.filename)
+            
+            # Create upload directory off the event loop
             upload_dir = Path(f"uploads/{session_id}")
-            upload_dir.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(upload_dir.mkdir, parents=True, exist_ok=True)
             
             # Save file (simplified - would extract metadata in production)
-            file_path = upload_dir / file.filename
+            file_path = upload_dir / filename
+            if file_path.resolve().parent != upload_dir.resolve():
+                raise HTTPException(status_code=400, detail="Invalid filename")
+            async with aiofiles.open(file_path, "wb") as out:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    await out.write(chunk)
             
             paper = Paper(
                 id=paper_id,
                 session_id=session_id,
-                filename=file.filename,
-                title=file.filename.replace('.pdf', ''),
+                filename=filename,
+                title=filename.replace('.pdf', ''),
                 authors=[],
                 abstract="Abstract would be extracted from PDF",
                 upload_time=datetime.utcnow(),
                 file_path=str(file_path)
             )
             
-            papers_db[paper_id] = paper
+            _store_paper(paper)
             uploaded_papers.append(paper)
     
     # Handle URL uploads if provided
@@ -64,7 +94,7 @@ async def upload_papers(
                 upload_time=datetime.utcnow(),
                 url=url
             )
-            papers_db[paper_id] = paper
+            _store_paper(paper)
             uploaded_papers.append(paper)
     
     return {
@@ -81,21 +111,24 @@ async def list_papers(
     session_id: Optional[str] = None
 ):
     """List uploaded papers with pagination."""
-    # Filter by session if provided
-    filtered_papers = list(papers_db.values())
-    if session_id:
-        filtered_papers = [p for p in filtered_papers if p.session_id == session_id]
-    
-    # Pagination
-    total = len(filtered_papers)
     start = (page - 1) * page_size
     end = start + page_size
     
+    # Session lookups use the per-session index; papers are kept in upload
+    # order, so a page is a slice rather than a filtered copy
+    if session_id:
+        filtered_papers = session_papers.get(session_id, [])
+        total = len(filtered_papers)
+        page_papers = filtered_papers[start:end]
+    else:
+        total = len(papers_db)
+        page_papers = list(itertools.islice(papers_db.values(), start, end))
+    
     return PaperListResponse(
         total_count=total,
         current_page=page,
         page_size=page_size,
-        papers=filtered_papers[start:end]
+        papers=page_papers
     )
 
 
@@ -7,6 +7,7 @@ import uuid
 from datetime import datetime
 
 from src.api.models.base import SurveyRequest, SurveyJob, SurveyStatus, JobStatus
+from src.api.endpoints.websocket import manager
 
 router = APIRouter()
 
@@ -18,15 +19,37 @@ async def generate_survey_task(survey_id: str, request: SurveyRequest):
     """Background task for survey generation."""
     # This would integrate with the actual survey generation system
     job = jobs_db[survey_id]
-    job.status = JobStatus.RUNNING
-    job.started_at = datetime.utcnow()
-    
-    # Simulate survey generation
-    # In production, would call actual survey system
+    try:
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        await manager.broadcast(survey_id, {
+            "type": "progress",
+            "survey_id": survey_id,
+            "status": job.status.value,
+            "message": "Survey generation in progress..."
+        })
+        
+        # Simulate survey generation
+        # In production, would call actual survey system
+        
+        job.status = JobStatus.COMPLETED
+        job.completed_at = datetime.utcnow()
+        job.result_path = f"surveys/{survey_id}.json"
+        message = "Survey generation completed"
+    except Exception as e:
+        job.status = JobStatus.FAILED
+        job.completed_at = datetime.utcnow()
+        job.error_message = str(e)
+        message = f"Survey generation failed: {e}"
     
-    job.status = JobStatus.COMPLETED
-    job.completed_at = datetime.utcnow()
-    job.result_path = f"surveys/{survey_id}.json"
+    # Final update either way, so subscribers stop waiting and the
+    # connection manager can release the survey's stored state
+    await manager.broadcast(survey_id, {
+        "type": "progress",
+        "survey_id": survey_id,
+        "status": job.status.value,
+        "message": message
+    }, final=True)
 
 
 @router.post("/")
@@ -5,36 +5,107 @@ WebSocket endpoint for real-time updates
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import asyncio
 import json
+from collections import defaultdict
+from typing import Dict, Set
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 router = APIRouter()
 
 # Connection manager
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: dict = {}
+        self.active_connections: Dict[str, Set[WebSocket]] = defaultdict(set)
+        # Latest serialized update per survey, its version, and the condition
+        # that wakes connection handlers when a new update is published
+        self.latest_updates: dict = {}
+        self.update_versions: dict = {}
+        self.update_conditions: dict = {}
+        # Surveys whose final update has been published
+        self.finished_surveys: Set[str] = set()
     
     async def connect(self, websocket: WebSocket, survey_id: str):
         await websocket.accept()
-        if survey_id not in self.active_connections:
-            self.active_connections[survey_id] = []
-        self.active_connections[survey_id].append(websocket)
+        self.active_connections[survey_id].add(websocket)
     
     def disconnect(self, websocket: WebSocket, survey_id: str):
-        if survey_id in self.active_connections:
-            self.active_connections[survey_id].remove(websocket)
+        connections = self.active_connections.get(survey_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
+                del self.active_connections[survey_id]
+                # Keep the latest state only for a survey still in progress,
+                # so a client reconnecting mid-run catches up
+                if survey_id in self.finished_surveys or survey_id not in self.update_versions:
+                    self._release(survey_id)
+    
+    def _release(self, survey_id: str):
+        """Drop the stored update state of a survey."""
+        self.latest_updates.pop(survey_id, None)
+        self.update_versions.pop(survey_id, None)
+        self.update_conditions.pop(survey_id, None)
+        self.finished_surveys.discard(survey_id)
     
-    async def broadcast(self, survey_id: str, message: dict):
-        if survey_id in self.active_connections:
-            for connection in self.active_connections[survey_id]:
-                await connection.send_json(message)
+    def _condition(self, survey_id: str) -> asyncio.Condition:
+        if survey_id not in self.update_conditions:
+            self.update_conditions[survey_id] = asyncio.Condition()
+        return self.update_conditions[survey_id]
+    
+    async def broadcast(self, survey_id: str, message: dict, final: bool = False) -> bool:
+        """Publish an update; each connected handler sends it to its client.
+        
+        An update identical to the latest one is dropped without waking
+        handlers. A final update releases the survey's stored state once
+        no client is connected. Returns whether the update was published.
+        """
+        # Serialize once here rather than once per connection
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(message, default=str).decode()
+        else:
+            payload = json.dumps(message, separators=(",", ":"), default=str)
+        condition = self._condition(survey_id)
+        async with condition:
+            published = self.latest_updates.get(survey_id) != payload
+            if published:
+                self.latest_updates[survey_id] = payload
+                self.update_versions[survey_id] = self.update_versions.get(survey_id, 0) + 1
+                condition.notify_all()
+        if final:
+            self.finished_surveys.add(survey_id)
+            if survey_id not in self.active_connections:
+                self._release(survey_id)
+        return published
+    
+    async def wait_for_update(self, survey_id: str, last_version: int):
+        """Block until an update newer than last_version is published."""
+        condition = self._condition(survey_id)
+        async with condition:
+            await condition.wait_for(
+                lambda: self.update_versions.get(survey_id, 0) > last_version
+            )
+            return self.update_versions[survey_id], self.latest_updates[survey_id]
 
 manager = ConnectionManager()
 
 
+async def _forward_updates(websocket: WebSocket, survey_id: str):
+    """Send each newly published update for a survey to one client."""
+    # Starting from version 0 sends a late joiner the latest published state
+    last_version = 0
+    while True:
+        last_version, payload = await manager.wait_for_update(survey_id, last_version)
+        await websocket.send_text(payload)
+
+
 @router.websocket("/{survey_id}")
 async def websocket_endpoint(websocket: WebSocket, survey_id: str):
     """WebSocket endpoint for real-time survey generation updates."""
     await manager.connect(websocket, survey_id)
+    forwarder = None
     
     try:
         # Send initial connection message
@@ -44,17 +115,15 @@ async def websocket_endpoint(websocket: WebSocket, survey_id: str):
             "survey_id": survey_id
         })
         
-        # Keep connection alive and send periodic updates
+        # Push updates as they are published instead of polling, while
+        # reading from the client so a disconnect is noticed immediately
+        forwarder = asyncio.create_task(_forward_updates(websocket, survey_id))
         while True:
-            # In production, would send actual progress updates
-            await asyncio.sleep(5)
-            await websocket.send_json({
-                "type": "progress",
-                "survey_id": survey_id,
-                "progress": 50,
-                "message": "Survey generation in progress..."
-            })
+            await websocket.receive_text()
             
     except WebSocketDisconnect:
+        print(f"Client disconnected from survey {survey_id}")
+    finally:
+        if forwarder is not None:
+            forwarder.cancel()
         manager.disconnect(websocket, survey_id)
-        print(f"Client disconnected from survey {survey_id}")
\ No newline at end of file
@@ -3,15 +3,35 @@ Job Manager for handling survey generation tasks
 """
 
 import asyncio
-from typing import Dict, List, Optional, Any
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Set
 from datetime import datetime, timedelta
 import logging
 import json
+import os
 from pathlib import Path
 from enum import Enum
+from types import MappingProxyType
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize a job record compactly (orjson encodes datetimes natively)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=str, separators=(",", ":"))
+
 
 class JobStatus(Enum):
     """Job status enumeration"""
@@ -22,6 +42,15 @@ class JobStatus(Enum):
     CANCELLED = "cancelled"
 
 
+# Status values as plain strings for the hot status paths
+_PENDING = JobStatus.PENDING.value
+_PROCESSING = JobStatus.PROCESSING.value
+_COMPLETED = JobStatus.COMPLETED.value
+_FAILED = JobStatus.FAILED.value
+_CANCELLED = JobStatus.CANCELLED.value
+_FINISHED = frozenset((_COMPLETED, _FAILED))
+
+
 class JobPhase(Enum):
     """Job phase enumeration"""
     INITIALIZING = "initializing"
@@ -33,9 +62,109 @@ class JobPhase(Enum):
     FINALIZING = "finalizing"
 
 
+# Base progress percentage reached at the start of each phase
+_PHASE_WEIGHTS = MappingProxyType({
+    JobPhase.INITIALIZING.value: 5,
+    JobPhase.LOADING_PAPERS.value: 10,
+    JobPhase.GENERATING_OUTLINE.value: 20,
+    JobPhase.WRITING_SECTIONS.value: 40,
+    JobPhase.VERIFYING_QUALITY.value: 60,
+    JobPhase.IMPROVING_CONTENT.value: 80,
+    JobPhase.FINALIZING.value: 95
+})
+
+
+# Within max_iterations, iteration progress adds up to 20 points, one per bucket, so
+# _PROGRESS_TABLE[phase][bucket] equals the phase weight plus
+# floor(20 * current_iteration / max_iterations), capped at 95
+_ITER_BUCKETS = 20
+_PHASE_IDX = MappingProxyType({phase: idx for idx, phase in enumerate(_PHASE_WEIGHTS)})
+_PROGRESS_TABLE = tuple(
+    tuple(min(base + bucket, 95) for bucket in range(_ITER_BUCKETS + 1))
+    for base in _PHASE_WEIGHTS.values()
+)
+
+
+def _calc_progress(phase: str, current_iteration: int, max_iterations: int) -> int:
+    """Progress percentage for a phase and iteration, by table lookup"""
+    # Add iteration progress for iterative systems
+    bucket = 0
+    if current_iteration > 0 and max_iterations > 0:
+        bucket = current_iteration * _ITER_BUCKETS // max_iterations
+    
+    phase_idx = _PHASE_IDX.get(phase)
+    if phase_idx is None:
+        return min(bucket, 95)
+    if bucket > _ITER_BUCKETS:
+        # Runs past max_iterations keep gaining progress up to the cap
+        return min(_PHASE_WEIGHTS[phase] + bucket, 95)
+    return _PROGRESS_TABLE[phase_idx][bucket]
+
+
+@dataclass
+class Job:
+    """State of one survey generation job"""
+    __slots__ = (
+        'job_id', 'topic', 'system_type', 'status', 'phase', 'created_at',
+        'started_at', 'started_ts', 'completed_at', 'progress',
+        'current_iteration', 'max_iterations', 'quality_score',
+        'estimated_time_remaining', 'result', 'error', 'metadata'
+    )
+    job_id: str
+    topic: str
+    system_type: str
+    status: str
+    phase: str
+    created_at: str
+    started_at: Optional[str]
+    started_ts: Optional[float]  # time.time() at start, for estimates
+    completed_at: Optional[str]
+    progress: int
+    current_iteration: int
+    max_iterations: int
+    quality_score: Optional[float]
+    estimated_time_remaining: Optional[int]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    metadata: Dict[str, Any]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict view for serialization"""
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Job':
+        """Rebuild a job from a history record"""
+        return cls(
+            job_id=data["job_id"],
+            topic=data.get("topic", ""),
+            system_type=data.get("system_type", ""),
+            status=data["status"],
+            phase=data.get("phase", JobPhase.INITIALIZING.value),
+            created_at=data.get("created_at"),
+            started_at=data.get("started_at"),
+            started_ts=data.get("started_ts"),
+            completed_at=data.get("completed_at"),
+            progress=data.get("progress", 0),
+            current_iteration=data.get("current_iteration", 0),
+            max_iterations=data.get("max_iterations", 5),
+            quality_score=data.get("quality_score"),
+            estimated_time_remaining=data.get("estimated_time_remaining"),
+            result=data.get("result"),
+            error=data.get("error"),
+            metadata=data.get("metadata", {})
+        )
+
+
 class JobManager:
     """Manages survey generation jobs"""
     
+    # Appended history lines tolerated before the file is rewritten
+    HISTORY_COMPACT_THRESHOLD = 1000
+    
+    # Pre-JSON Lines history file (one JSON object keyed by job id)
+    LEGACY_HISTORY_FILE = Path("data/job_history.json")
+    
     def __init__(self, max_concurrent_jobs: int = 5):
         """
         Initialize job manager
@@ -43,11 +172,31 @@ class JobManager:
         Args:
             max_concurrent_jobs: Maximum number of concurrent jobs
         """
-        self.jobs: Dict[str, Dict[str, Any]] = {}
-        self.job_queue: List[str] = []
-        self.active_jobs: List[str] = []
+        self.jobs: Dict[str, Job] = {}
+        # Pending job ids; a plain deque so the manager can be built
+        # before any event loop runs
+        self.job_queue: Deque[str] = deque()
+        self.active_jobs: Set[str] = set()
+        # Cancelled ids still sitting in job_queue; skipped when popped
+        self._cancelled: Set[str] = set()
+        # Jobs per status, kept in step with every status transition
+        self._status_counts: Dict[str, int] = defaultdict(int)
         self.max_concurrent_jobs = max_concurrent_jobs
-        self.job_history_file = Path("data/job_history.json")
+        self._workers: List[asyncio.Task] = []
+        # Ids popped by a worker and not yet finished
+        self._in_flight = 0
+        # Queue events, created in the loop that runs the workers
+        self._queue_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue_ready: Optional[asyncio.Event] = None
+        self._queue_idle: Optional[asyncio.Event] = None
+        self.job_history_file = Path("data/job_history.jsonl")
+        self._dirty_count = 0
+        self._history_writes: Set[asyncio.Task] = set()
+        # Debounced full history rewrite, run by a background task
+        self._save_pending: Optional[asyncio.Event] = None
+        self._save_task: Optional[asyncio.Task] = None
+        # Per-job events a pipeline sets as each phase completes
+        self._phase_events: Dict[str, asyncio.Event] = {}
         self._load_history()
     
     def create_job(
@@ -56,7 +205,7 @@ class JobManager:
         topic: str,
         system_type: str,
         **kwargs
-    ) -> Dict[str, Any]:
+    ) -> Job:
         """
         Create a new job
         
@@ -67,34 +216,36 @@ class JobManager:
             **kwargs: Additional job parameters
             
         Returns:
-            Job dictionary
+            The new job
         """
-        job = {
-            "job_id": job_id,
-            "topic": topic,
-            "system_type": system_type,
-            "status": JobStatus.PENDING.value,
-            "phase": JobPhase.INITIALIZING.value,
-            "created_at": datetime.now().isoformat(),
-            "started_at": None,
-            "completed_at": None,
-            "progress": 0,
-            "current_iteration": 0,
-            "max_iterations": kwargs.get("max_iterations", 5),
-            "quality_score": None,
-            "estimated_time_remaining": None,
-            "result": None,
-            "error": None,
-            "metadata": kwargs
-        }
+        job = Job(
+            job_id=job_id,
+            topic=topic,
+            system_type=system_type,
+            status=_PENDING,
+            phase=JobPhase.INITIALIZING.value,
+            created_at=datetime.now().isoformat(),
+            started_at=None,
+            started_ts=None,
+            completed_at=None,
+            progress=0,
+            current_iteration=0,
+            max_iterations=kwargs.get("max_iterations", 5),
+            quality_score=None,
+            estimated_time_remaining=None,
+            result=None,
+            error=None,
+            metadata=kwargs
+        )
         
         self.jobs[job_id] = job
-        self.job_queue.append(job_id)
+        self._status_counts[job.status] += 1
+        self._enqueue(job_id)
         
         logger.info(f"Job created: {job_id} - {topic}")
         return job
     
-    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+    def get_job(self, job_id: str) -> Optional[Job]:
         """Get job by ID"""
         return self.jobs.get(job_id)
     
@@ -112,7 +263,24 @@ class JobManager:
             job_id: Job identifier
             status: New status
             phase: New phase
-            **updates: Additional updates
+            **updates: Additional job fields; unknown keys go to metadata
+            
+        Returns:
+            True if successful
+        """
+        return self.update_job_batch(job_id, [dict(updates, status=status, phase=phase)])
+    
+    def update_job_batch(self, job_id: str, changes: List[Dict[str, Any]]) -> bool:
+        """
+        Apply several updates to a job as one state transition
+        
+        Each change takes the same keys as update_job's arguments and is
+        applied in order; the time estimate, history record and log entry
+        run once for the whole batch.
+        
+        Args:
+            job_id: Job identifier
+            changes: Update dictionaries (status, phase, job fields)
             
         Returns:
             True if successful
@@ -121,28 +289,52 @@ class JobManager:
             return False
         
         job = self.jobs[job_id]
+        now = time.time()
+        old_progress = job.progress
+        old_status = job.status
+        
+        for change in changes:
+            self._apply_change(job, now, dict(change))
+        
+        # Re-estimate remaining time only when progress moved
+        if job.progress != old_progress and job.started_ts and job.progress > 0:
+            job.estimated_time_remaining = self._estimate_time_remaining(job, now)
+        
+        if job.status != old_status and job.status in _FINISHED:
+            self._record_history(job)
+        
+        logger.info(f"Job updated: {job_id} - Status: {job.status}, Phase: {job.phase}")
+        return True
+    
+    def _apply_change(self, job: Job, now: float, change: Dict[str, Any]):
+        """Apply one update dictionary to a job"""
+        status = change.pop("status", None)
+        phase = change.pop("phase", None)
         
         if status:
-            job["status"] = status
-            if status == JobStatus.PROCESSING.value and not job["started_at"]:
-                job["started_at"] = datetime.now().isoformat()
-            elif status in [JobStatus.COMPLETED.value, JobStatus.FAILED.value]:
-                job["completed_at"] = datetime.now().isoformat()
+            self._set_status(job, status)
+            if status == _PROCESSING and not job.started_at:
+                job.started_ts = now
+                job.started_at = datetime.fromtimestamp(now).isoformat()
+            elif status in _FINISHED:
+                job.completed_at = datetime.fromtimestamp(now).isoformat()
         
         if phase:
-            job["phase"] = phase
-            job["progress"] = self._calculate_progress(phase, job["current_iteration"], job["max_iterations"])
+            job.phase = phase
+            job.progress = self._calculate_progress(phase, job.current_iteration, job.max_iterations)
         
         # Apply additional updates
-        for key, value in updates.items():
-            job[key] = value
-        
-        # Estimate remaining time
-        if job["started_at"] and job["progress"] > 0:
-            job["estimated_time_remaining"] = self._estimate_time_remaining(job)
-        
-        logger.info(f"Job updated: {job_id} - Status: {status}, Phase: {phase}")
-        return True
+        for key, value in change.items():
+            if key in Job.__slots__:
+                setattr(job, key, value)
+            else:
+                job.metadata[key] = value
+    
+    def _set_status(self, job: Job, status: str):
+        """Change a job's status and keep the status counts current"""
+        self._status_counts[job.status] -= 1
+        self._status_counts[status] += 1
+        job.status = status
     
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a job"""
@@ -151,40 +343,106 @@ class JobManager:
         
         job = self.jobs[job_id]
         
-        if job["status"] in [JobStatus.COMPLETED.value, JobStatus.FAILED.value]:
+        if job.status in _FINISHED:
             return False
         
-        job["status"] = JobStatus.CANCELLED.value
-        job["completed_at"] = datetime.now().isoformat()
+        was_pending = job.status == _PENDING
+        self._set_status(job, _CANCELLED)
+        job.completed_at = datetime.now().isoformat()
         
-        # Remove from queues
-        if job_id in self.job_queue:
-            self.job_queue.remove(job_id)
-        if job_id in self.active_jobs:
-            self.active_jobs.remove(job_id)
+        # Remove from queues (pending ids are tombstoned, not searched for)
+        if was_pending:
+            self._cancelled.add(job_id)
+        self.active_jobs.discard(job_id)
         
         logger.info(f"Job cancelled: {job_id}")
         return True
     
+    def _enqueue(self, job_id: str):
+        """Queue a job id and wake any waiting worker"""
+        self.job_queue.append(job_id)
+        if self._queue_ready is not None:
+            self._queue_idle.clear()
+            self._queue_ready.set()
+    
+    def _bind_queue_events(self):
+        """Create the queue events in the running loop if not already bound"""
+        loop = asyncio.get_running_loop()
+        if self._queue_loop is not loop:
+            self._queue_loop = loop
+            self._queue_ready = asyncio.Event()
+            self._queue_idle = asyncio.Event()
+        if self.job_queue:
+            self._queue_ready.set()
+        if not self.job_queue and not self._in_flight:
+            self._queue_idle.set()
+        else:
+            self._queue_idle.clear()
+    
+    def start_workers(self):
+        """Start max_concurrent_jobs workers consuming the job queue"""
+        self._bind_queue_events()
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self.max_concurrent_jobs:
+            self._workers.append(asyncio.create_task(self._worker()))
+    
+    async def stop_workers(self):
+        """Cancel queue workers and wait for them to exit"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+    
+    async def _worker(self):
+        """Take jobs off the queue one at a time until cancelled"""
+        ready = self._queue_ready
+        while True:
+            while not self.job_queue:
+                ready.clear()
+                await ready.wait()
+            job_id = self.job_queue.popleft()
+            self._in_flight += 1
+            try:
+                if job_id in self._cancelled:
+                    self._cancelled.discard(job_id)
+                    continue
+                self.active_jobs.add(job_id)
+                
+                # Would be actual survey generation in production
+                await self._process_job(job_id)
+            finally:
+                self._in_flight -= 1
+                if not self.job_queue and not self._in_flight:
+                    self._queue_idle.set()
+    
     async def process_queue(self):
-        """Process job queue"""
-        while self.job_queue:
-            if len(self.active_jobs) >= self.max_concurrent_jobs:
-                await asyncio.sleep(1)
-                continue
-            
-            job_id = self.job_queue.pop(0)
-            self.active_jobs.append(job_id)
-            
-            # Start job processing (would be actual survey generation in production)
-            asyncio.create_task(self._process_job(job_id))
+        """Process job queue until it is drained"""
+        self.start_workers()
+        await self._queue_idle.wait()
+    
+    def phase_event(self, job_id: str) -> asyncio.Event:
+        """
+        Get the event that drives a job through its phases
+        
+        The pipeline running the job sets the event when a phase finishes;
+        jobs without an event move through the phases without waiting.
+        """
+        if job_id not in self._phase_events:
+            self._phase_events[job_id] = asyncio.Event()
+        return self._phase_events[job_id]
+    
+    async def _wait_phase(self, phase_done: Optional[asyncio.Event]):
+        """Wait until the current phase is reported done"""
+        if phase_done is None:
+            await asyncio.sleep(0)
+            return
+        await phase_done.wait()
+        phase_done.clear()
     
     async def _process_job(self, job_id: str):
         """Process a single job (placeholder for actual implementation)"""
+        phase_done = self._phase_events.get(job_id)
         try:
-            # Update status
-            self.update_job(job_id, status=JobStatus.PROCESSING.value)
-            
             # Simulate processing phases
             phases = [
                 JobPhase.LOADING_PAPERS,
@@ -195,14 +453,21 @@ class JobManager:
                 JobPhase.FINALIZING
             ]
             
-            for phase in phases:
+            # Start processing and enter the first phase in one transition
+            self.update_job_batch(job_id, [
+                {"status": _PROCESSING},
+                {"phase": phases[0].value}
+            ])
+            await self._wait_phase(phase_done)
+            
+            for phase in phases[1:]:
                 self.update_job(job_id, phase=phase.value)
-                await asyncio.sleep(2)  # Simulate work
+                await self._wait_phase(phase_done)
             
             # Complete job
             self.update_job(
                 job_id,
-                status=JobStatus.COMPLETED.value,
+                status=_COMPLETED,
                 quality_score=4.0,
                 result={"title": "Generated Survey", "sections": []}
             )
@@ -211,101 +476,183 @@ class JobManager:
             logger.error(f"Job processing error: {e}")
             self.update_job(
                 job_id,
-                status=JobStatus.FAILED.value,
+                status=_FAILED,
                 error=str(e)
             )
         finally:
-            if job_id in self.active_jobs:
-                self.active_jobs.remove(job_id)
+            self.active_jobs.discard(job_id)
+            self._phase_events.pop(job_id, None)
     
     def get_queue_status(self) -> Dict[str, Any]:
         """Get queue status"""
         return {
             "total_jobs": len(self.jobs),
-            "pending": len(self.job_queue),
+            "pending": len(self.job_queue) - len(self._cancelled),
             "active": len(self.active_jobs),
-            "completed": sum(1 for j in self.jobs.values() if j["status"] == JobStatus.COMPLETED.value),
-            "failed": sum(1 for j in self.jobs.values() if j["status"] == JobStatus.FAILED.value),
+            "completed": self._status_counts[_COMPLETED],
+            "failed": self._status_counts[_FAILED],
             "max_concurrent": self.max_concurrent_jobs
         }
     
     def _calculate_progress(self, phase: str, current_iteration: int, max_iterations: int) -> int:
         """Calculate job progress percentage"""
-        phase_weights = {
-            JobPhase.INITIALIZING.value: 5,
-            JobPhase.LOADING_PAPERS.value: 10,
-            JobPhase.GENERATING_OUTLINE.value: 20,
-            JobPhase.WRITING_SECTIONS.value: 40,
-            JobPhase.VERIFYING_QUALITY.value: 60,
-            JobPhase.IMPROVING_CONTENT.value: 80,
-            JobPhase.FINALIZING.value: 95
-        }
-        
-        base_progress = phase_weights.get(phase, 0)
-        
-        # Add iteration progress for iterative systems
-        if current_iteration > 0 and max_iterations > 0:
-            iteration_progress = (current_iteration / max_iterations) * 20
-            base_progress = min(base_progress + iteration_progress, 95)
-        
-        return int(base_progress)
+        return _calc_progress(phase, current_iteration, max_iterations)
     
-    def _estimate_time_remaining(self, job: Dict[str, Any]) -> int:
+    def _estimate_time_remaining(self, job: Job, now: Optional[float] = None) -> int:
         """Estimate time remaining in seconds"""
-        if not job["started_at"] or job["progress"] == 0:
+        if not job.started_ts or job.progress == 0:
             return None
         
-        started = datetime.fromisoformat(job["started_at"])
-        elapsed = (datetime.now() - started).total_seconds()
+        elapsed = (now if now is not None else time.time()) - job.started_ts
         
         # Simple linear estimation
-        if job["progress"] > 0:
-            total_estimated = elapsed / (job["progress"] / 100)
+        if job.progress > 0:
+            total_estimated = elapsed / (job.progress / 100)
             remaining = total_estimated - elapsed
             return max(0, int(remaining))
         
         return None
     
     def _load_history(self):
-        """Load job history from file"""
-        if self.job_history_file.exists():
-            try:
-                with open(self.job_history_file, "r") as f:
-                    history = json.load(f)
-                    # Only load completed/failed jobs
-                    for job_id, job in history.items():
-                        if job["status"] in [JobStatus.COMPLETED.value, JobStatus.FAILED.value]:
-                            self.jobs[job_id] = job
-            except Exception as e:
-                logger.error(f"Failed to load job history: {e}")
+        """Load job history from file, one JSON record per line"""
+        if not self.job_history_file.exists():
+            self._import_legacy_history()
+            return
+        try:
+            with open(self.job_history_file, "r") as f:
+                for line in f:
+                    if line.strip():
+                        self._load_record(_json_loads(line))
+        except Exception as e:
+            logger.error(f"Failed to load job history: {e}")
+    
+    def _load_record(self, record: Dict[str, Any]):
+        """Load one history record; only completed/failed jobs, later records win"""
+        if record["status"] not in _FINISHED:
+            return
+        job = Job.from_dict(record)
+        previous = self.jobs.get(job.job_id)
+        if previous:
+            self._status_counts[previous.status] -= 1
+        self.jobs[job.job_id] = job
+        self._status_counts[job.status] += 1
+    
+    def _import_legacy_history(self):
+        """Convert a legacy job_history.json into the JSON Lines history file"""
+        legacy_file = self.LEGACY_HISTORY_FILE
+        if not legacy_file.exists():
+            return
+        try:
+            with open(legacy_file, "r") as f:
+                history = json.load(f)
+            for record in history.values():
+                self._load_record(record)
+        except Exception as e:
+            logger.error(f"Failed to import legacy job history: {e}")
+            return
+        # Writing the new file means the import runs only once
+        self.save_history()
+        logger.info(f"Imported {len(self.jobs)} jobs from {legacy_file}")
+    
+    def _record_history(self, job: Job):
+        """Append a finished job to the history file"""
+        self._dirty_count += 1
+        if self._dirty_count > self.HISTORY_COMPACT_THRESHOLD:
+            self._request_save()
+            return
+        
+        line = _json_dumps(job.to_dict()) + "\n"
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._append_history_line(line)
+        else:
+            task = loop.create_task(asyncio.to_thread(self._append_history_line, line))
+            self._history_writes.add(task)
+            task.add_done_callback(self._history_writes.discard)
+    
+    def _append_history_line(self, line: str):
+        """Append one serialized record to the history file"""
+        try:
+            self.job_history_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.job_history_file, "a") as f:
+                f.write(line)
+        except Exception as e:
+            logger.error(f"Failed to append job history: {e}")
     
     def save_history(self):
-        """Save job history to file"""
+        """Rewrite (compact) the job history file"""
         try:
             self.job_history_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.job_history_file, "w") as f:
-                json.dump(self.jobs, f, indent=2, default=str)
+            tmp_path = self.job_history_file.with_name(self.job_history_file.name + ".tmp")
+            with open(tmp_path, "w") as f:
+                for job in list(self.jobs.values()):
+                    f.write(_json_dumps(job.to_dict()) + "\n")
+            os.replace(tmp_path, self.job_history_file)
+            self._dirty_count = 0
         except Exception as e:
             logger.error(f"Failed to save job history: {e}")
     
+    async def save_history_async(self):
+        """Rewrite the job history file without blocking the event loop"""
+        await asyncio.to_thread(self.save_history)
+    
+    def _request_save(self):
+        """
+        Schedule a history rewrite
+        
+        Inside an event loop the request only sets an event; a background
+        task coalesces bursts of requests into one rewrite in a worker
+        thread. Outside a loop the history is written immediately.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save_history()
+            return
+        
+        if self._save_task is None or self._save_task.done() or self._save_task.get_loop() is not loop:
+            self._save_pending = asyncio.Event()
+            self._save_task = loop.create_task(self._save_loop())
+        self._save_pending.set()
+    
+    async def _save_loop(self):
+        """Rewrite the history once per batch of save requests"""
+        pending = self._save_pending
+        while True:
+            await pending.wait()
+            pending.clear()
+            await asyncio.to_thread(self.save_history)
+    
+    async def flush_history(self):
+        """Write any requested history rewrite and stop the save task"""
+        task, pending = self._save_task, self._save_pending
+        self._save_task = self._save_pending = None
+        if task is None:
+            return
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        if pending.is_set():
+            await self.save_history_async()
+    
     def cleanup_old_jobs(self, days: int = 7):
         """Remove old completed/failed jobs"""
         cutoff = datetime.now() - timedelta(days=days)
         
         jobs_to_remove = []
         for job_id, job in self.jobs.items():
-            if job["status"] in [JobStatus.COMPLETED.value, JobStatus.FAILED.value]:
-                if job.get("completed_at"):
-                    completed = datetime.fromisoformat(job["completed_at"])
+            if job.status in _FINISHED:
+                if job.completed_at:
+                    completed = datetime.fromisoformat(job.completed_at)
                     if completed < cutoff:
                         jobs_to_remove.append(job_id)
         
         for job_id in jobs_to_remove:
-            del self.jobs[job_id]
+            self._status_counts[self.jobs.pop(job_id).status] -= 1
         
         if jobs_to_remove:
             logger.info(f"Cleaned up {len(jobs_to_remove)} old jobs")
-            self.save_history()
+            self._request_save()
 
 
 # Global job manager instance
@@ -20,6 +20,7 @@ logger = logging.getLogger(__name__)
 
 # Import routers
 from src.api.endpoints import papers, surveys, websocket, health
+from src.api.middleware.auth import create_api_key_middleware, WebSocketAPIKeyMiddleware
 
 
 @asynccontextmanager
@@ -40,6 +41,13 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Require an API key when one is configured; registered before CORS so
+# that CORS stays the outermost layer
+api_key = os.getenv("SURVEY_API_KEY")
+if api_key:
+    app.middleware("http")(create_api_key_middleware(api_key))
+    app.add_middleware(WebSocketAPIKeyMiddleware, api_key=api_key)
+
 # Configure CORS
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 app.add_middleware(
@@ -0,0 +1,63 @@
+"""
+API key authentication middleware
+"""
+
+import hmac
+from urllib.parse import parse_qs
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+# Paths served without an API key
+PUBLIC_PATHS = frozenset({"/", "/api/v1/health", "/docs", "/redoc", "/openapi.json"})
+
+
+def create_api_key_middleware(api_key: str):
+    """Build an HTTP middleware that requires the X-API-Key header.
+    
+    Public paths and CORS preflight requests skip the check; the key is
+    compared in constant time.
+    """
+    expected = api_key.encode()
+    
+    async def api_key_middleware(request: Request, call_next):
+        if request.url.path in PUBLIC_PATHS or request.method == "OPTIONS":
+            return await call_next(request)
+        
+        provided = request.headers.get("x-api-key", "").encode()
+        if not hmac.compare_digest(provided, expected):
+            return JSONResponse(
+                status_code=401,
+                content={"error": "Unauthorized", "message": "Invalid or missing API key"}
+            )
+        return await call_next(request)
+    
+    return api_key_middleware
+
+
+class WebSocketAPIKeyMiddleware:
+    """ASGI middleware that requires the API key on WebSocket connections.
+    
+    HTTP middleware never sees WebSocket scopes, so the handshake is checked
+    here. Browsers cannot set headers on a WebSocket, so the key may also be
+    passed as the api_key query parameter. Rejected handshakes are closed
+    with policy-violation code 1008.
+    """
+    
+    def __init__(self, app, api_key: str):
+        self.app = app
+        self.expected = api_key.encode()
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket" and not self._authorized(scope):
+            await receive()  # websocket.connect
+            await send({"type": "websocket.close", "code": 1008})
+            return
+        await self.app(scope, receive, send)
+    
+    def _authorized(self, scope) -> bool:
+        provided = dict(scope.get("headers", [])).get(b"x-api-key")
+        if provided is None:
+            query = parse_qs(scope.get("query_string", b"").decode())
+            provided = query.get("api_key", [""])[0].encode()
+        return hmac.compare_digest(provided, self.expected)
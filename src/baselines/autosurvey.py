@@ -35,6 +35,16 @@ class SurveySection:
         """Post-initialization to set default citations list if not provided."""
         if self.citations is None:
             self.citations = []
+            
+    @classmethod
+    def from_dict(cls, data: Dict, section_number: int) -> "SurveySection":
+        """Build a section from a plain dict with title/content/citations keys."""
+        return cls(
+            title=data.get('title', ''),
+            content=data.get('content', ''),
+            section_number=data.get('section_number', section_number),
+            citations=data.get('citations')
+        )
 
 
 class AutoSurveyBaseline:
@@ -110,14 +120,24 @@ class AutoSurveyBaseline:
         topic: str,
         target_sections: int
     ) -> List[str]:
-        """Generate outline by processing papers in chunks."""
-        outlines = []
-        
-        # Process papers in chunks
-        for i in range(0, len(papers), self.chunk_size):
-            chunk = papers[i:i + self.chunk_size]
-            chunk_outline = self._generate_chunk_outline(chunk, topic, target_sections)
-            outlines.append(chunk_outline)
+        """Generate outline by processing papers in chunks (chunks run in parallel)."""
+        chunks = [
+            papers[i:i + self.chunk_size]
+            for i in range(0, len(papers), self.chunk_size)
+        ]
+        
+        # Chunk outlines are independent LLM calls; map() keeps chunk order
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                outlines = list(executor.map(
+                    lambda chunk: self._generate_chunk_outline(chunk, topic, target_sections),
+                    chunks
+                ))
+        else:
+            outlines = [
+                self._generate_chunk_outline(chunk, topic, target_sections)
+                for chunk in chunks
+            ]
             
         # Merge outlines
         merged_outline = self._merge_outlines(outlines, target_sections)
@@ -3,20 +3,165 @@ AutoSurvey with Local Coherence Enhancement (LCE)
 Implements 2-pass refinement for adjacent sections
 """
 
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional, Tuple
+import asyncio
+import json
 import logging
 import re
 
+from src.baselines.autosurvey import AutoSurveyBaseline
+
 logger = logging.getLogger(__name__)
 
+# Characters of the previous section's ending shown as context
+PREV_TAIL_CHARS = 200
+
+# Sections shorter than this are left as they are; the fixed prompt
+# overhead outweighs what a rewrite could add to them
+MIN_LCE_CHARS = 400
+
+# Split point before each "## " section header
+_SECTION_SPLIT_RE = re.compile(r'(?=^## )', re.MULTILINE)
+
+# Markdown code fence some models wrap around a JSON reply
+_FENCE_RE = re.compile(r'^```[\w-]*[ \t]*\n?(.*?)\n?```$', re.DOTALL)
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Fixed instructions sent as the system message of every enhancement call,
+# so the prompt prefix stays identical across calls and can be cached
+_LCE_INSTRUCTIONS = """Task: Improve the coherence and flow of the current section by:
+1. Adding a smooth transition from the previous section
+2. Ensuring logical flow within the section
+3. If applicable, setting up the next section
+
+Please rewrite the current section with improved transitions and coherence. 
+Keep the same structure and content, but improve the flow and connections.
+Respond with JSON only: {"header": "<section title>", "body": "<enhanced section text without the header>"}"""
+
+# Separator between sections when several are rewritten in one call
+SECTION_SEP = "---SEP---"
+
+# System message for calls that rewrite a window of adjacent sections
+_LCE_WINDOW_INSTRUCTIONS = f"""Task: Improve the coherence and flow of the given adjacent sections by:
+1. Adding smooth transitions between them and from the previous section
+2. Ensuring logical flow within each section
+
+Keep the same structure and content of every section, but improve the flow and connections.
+Return ONLY the enhanced sections in the same order, each starting with its
+"## " header, separated by a line containing only {SECTION_SEP}"""
+
+# Per-call user message; the fixed parts are laid out once here and only
+# the placeholders are filled in for each call
+_LCE_CONTEXT_TMPL = (
+    "Previous section: {prev_title}\n"
+    "Current section: {current_title}\n"
+    "Next section: {next_title}\n\n"
+    "Current section content:\n{current}\n\n"
+    f"Previous section ending (last {PREV_TAIL_CHARS} chars):\n"
+    "{prev_tail}\n"
+)
+
+# Transition phrases used by the heuristic (LLM-free) enhancement
+_TRANSITIONS = {
+    'building': [
+        "Building on the previous discussion, ",
+        "Extending these concepts, ",
+        "Following this foundation, "
+    ],
+    'contrast': [
+        "In contrast to the previous approach, ",
+        "However, ",
+        "Alternatively, "
+    ],
+    'continuation': [
+        "Furthermore, ",
+        "Additionally, ",
+        "Moreover, "
+    ],
+    'conclusion': [
+        "In summary, ",
+        "To conclude this section, ",
+        "These findings suggest that "
+    ]
+}
+
+# Any known transition phrase, for a single-pass presence check
+_TRANSITION_RE = re.compile('|'.join(
+    re.escape(phrase) for phrases in _TRANSITIONS.values() for phrase in phrases
+))
+
+
+def _extract_title(section: str) -> str:
+    """Title from the "## " header that starts a parsed section"""
+    if not section.startswith('## '):
+        return "Section"
+    end = section.find('\n')
+    return section[3:end if end != -1 else len(section)].strip()
+
+
+def _section_from_response(content: str, current_section: str) -> str:
+    """Rebuild a "## " section from an enhancement response
+    
+    The expected reply is a JSON object with header and body fields,
+    optionally inside a code fence. A reply that looks like JSON but cannot
+    be used keeps the original section rather than pasting raw JSON into
+    the survey. Plain text replies are kept too: if the model dropped the
+    header, the original header line is put back instead of discarding
+    the rewrite.
+    """
+    content = content.strip()
+    fence = _FENCE_RE.match(content)
+    if fence:
+        content = fence.group(1).strip()
+    if content.startswith('{'):
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(content)
+            header = (obj.get("header") or _extract_title(current_section)).lstrip('#').strip()
+            body = obj["body"].strip()
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return current_section
+        return f"## {header}\n\n{body}" if body else current_section
+    if not content:
+        return current_section
+    if content.startswith('## ') or not current_section.startswith('## '):
+        return content
+    end = current_section.find('\n')
+    header = current_section if end == -1 else current_section[:end]
+    return f"{header}\n\n{content}"
+
+
+def _response_content(response) -> str:
+    """Text of a wrapper response; raises on the wrapper's error dicts"""
+    if isinstance(response, dict):
+        if "error" in response:
+            raise Exception(f"API Error: {response['error']}")
+        response = response["choices"][0]["message"]["content"]
+    return response
+
+
 class AutoSurveyLCE:
     """AutoSurvey with Local Coherence Enhancement"""
     
-    def __init__(self, claude_wrapper):
+    def __init__(self, claude_wrapper, max_concurrency: int = 4,
+                 single_pass: bool = False, min_section_chars: int = MIN_LCE_CHARS,
+                 mode: str = "llm", sections_per_call: int = 1):
+        if mode not in ("llm", "heuristic"):
+            raise ValueError(f"Unknown LCE mode: {mode}")
+        if sections_per_call < 1:
+            raise ValueError("sections_per_call must be at least 1")
         self.wrapper = claude_wrapper
-        self.baseline = None
-        # Import baseline here to avoid circular imports
-        from src.baselines.autosurvey import AutoSurveyBaseline
+        # "heuristic" adds transition phrases locally without any LLM calls
+        self.mode = mode
+        self.min_section_chars = min_section_chars
+        # Upper bound on enhancement calls in flight within one pass
+        self.max_concurrency = max_concurrency
+        # Enhance every section at once against its original neighbours,
+        # instead of the two alternating passes
+        self.single_pass = single_pass
+        # Above 1, adjacent sections are rewritten together in one call
+        # per window, in a single concurrent wave
+        self.sections_per_call = sections_per_call
         self.baseline = AutoSurveyBaseline(claude_wrapper)
     
     def generate_survey_with_lce(self, papers: List[Dict], topic: str = None) -> str:
@@ -34,6 +179,36 @@ class AutoSurveyLCE:
     
     def _apply_lce(self, survey: str) -> str:
         """Apply 2-pass Local Coherence Enhancement"""
+        # Without any "## " header there is a single section and nothing to do
+        if not survey.startswith("## ") and survey.find("\n## ") == -1:
+            return survey
+        
+        if self.mode == "heuristic":
+            return self._apply_heuristic_lce(survey)
+        return asyncio.run(self._apply_lce_async(survey))
+    
+    def _apply_heuristic_lce(self, survey: str) -> str:
+        """Add transition phrases to every section after the first, without LLM calls"""
+        sections = self._parse_sections(survey)
+        
+        if len(sections) < 2:
+            return survey
+        
+        enhanced = [sections[0]]
+        for prev, current, nxt in zip(sections, sections[1:], sections[2:] + [None]):
+            enhanced.append(self._add_transition_phrases(
+                current, prev_context=prev, next_context=nxt
+            ))
+        return "\n\n".join(enhanced)
+    
+    async def _apply_lce_async(self, survey: str) -> str:
+        """Run both LCE passes, enhancing the sections of a pass concurrently.
+        
+        Sections enhanced in the same pass only read neighbours from the
+        other pass, so they are independent of each other. With single_pass,
+        all sections are enhanced in one concurrent wave; each then sees its
+        neighbours' original text rather than their enhanced versions.
+        """
         
         # Parse sections
         sections = self._parse_sections(survey)
@@ -41,34 +216,155 @@ class AutoSurveyLCE:
         if len(sections) < 2:
             return survey  # No enhancement needed for single section
         
-        # Pass 1: Enhance odd-numbered sections (1, 3, 5, ...)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Titles are parsed once and refreshed only for rewritten sections
+        titles = [_extract_title(section) for section in sections]
+        
+        if self.sections_per_call > 1:
+            logger.info(f"LCE: Enhancing sections in windows of {self.sections_per_call}...")
+            await self._enhance_windows(sections, semaphore)
+            return "\n\n".join(sections)
+        
+        if self.single_pass:
+            logger.info("LCE: Enhancing all sections in a single pass...")
+            await self._enhance_pass(sections, titles, range(1, len(sections)), semaphore)
+            return "\n\n".join(sections)
+        
+        # Pass 1: Enhance odd-numbered sections (1, 3, 5, ...), skipping the first
         logger.info("LCE Pass 1: Enhancing odd sections...")
-        for i in range(0, len(sections), 2):
-            if i > 0:  # Has previous section
-                sections[i] = self._enhance_transition(
-                    sections[i-1], 
-                    sections[i],
-                    sections[i+1] if i+1 < len(sections) else None
-                )
+        await self._enhance_pass(sections, titles, range(2, len(sections), 2), semaphore)
         
         # Pass 2: Enhance even-numbered sections (2, 4, 6, ...)
         logger.info("LCE Pass 2: Enhancing even sections...")
-        for i in range(1, len(sections), 2):
-            sections[i] = self._enhance_transition(
-                sections[i-1],
-                sections[i],
-                sections[i+1] if i+1 < len(sections) else None
-            )
+        await self._enhance_pass(sections, titles, range(1, len(sections), 2), semaphore)
         
         # Reconstruct survey
         enhanced_survey = "\n\n".join(sections)
         return enhanced_survey
     
+    async def _enhance_pass(self, sections: List[str], titles: List[str],
+                            indices: Iterable[int], semaphore: asyncio.Semaphore):
+        """Enhance the given sections concurrently and splice results back
+        
+        All calls are built from the sections as they were before the pass.
+        Sections shorter than min_section_chars are skipped.
+        """
+        indices = [i for i in indices if len(sections[i]) >= self.min_section_chars]
+        # Neighbours aligned by index, so no per-call bounds checks are needed
+        nexts = sections[1:] + [None]
+        next_titles = titles[1:] + [None]
+        # Only the previous section's ending goes into the prompt, so hand
+        # each call that tail rather than the whole previous section
+        results = await asyncio.gather(*(
+            self._enhance_transition_async(
+                sections[i-1][-PREV_TAIL_CHARS:],
+                sections[i],
+                nexts[i],
+                (titles[i-1], titles[i], next_titles[i]),
+                semaphore
+            )
+            for i in indices
+        ))
+        for i, enhanced in zip(indices, results):
+            if enhanced is not sections[i]:
+                sections[i] = enhanced
+                titles[i] = _extract_title(enhanced)
+    
+    async def _enhance_windows(self, sections: List[str], semaphore: asyncio.Semaphore):
+        """Enhance every section after the first in windows of sections_per_call
+        
+        Each window sees the ending of the section before it, which is the
+        last section of the previous window. Windows whose sections are all
+        shorter than min_section_chars are skipped.
+        """
+        k = self.sections_per_call
+        windows = [
+            range(start, min(start + k, len(sections)))
+            for start in range(1, len(sections), k)
+        ]
+        windows = [
+            w for w in windows
+            if any(len(sections[i]) >= self.min_section_chars for i in w)
+        ]
+        results = await asyncio.gather(*(
+            self._enhance_window_async(sections, w, semaphore) for w in windows
+        ))
+        for window, enhanced in zip(windows, results):
+            sections[window.start:window.stop] = enhanced
+    
+    async def _enhance_window_async(self, sections: List[str], window: range,
+                                    semaphore: asyncio.Semaphore) -> List[str]:
+        """Run _enhance_window in a worker thread, bounded by the semaphore"""
+        prev_section = sections[window.start - 1]
+        async with semaphore:
+            return await asyncio.to_thread(
+                self._enhance_window,
+                prev_section[-PREV_TAIL_CHARS:],
+                sections[window.start:window.stop],
+                sections[window.stop] if window.stop < len(sections) else None,
+                prev_title=_extract_title(prev_section)
+            )
+    
+    def _enhance_window(self, prev_section: str, window: List[str],
+                        next_section: Optional[str] = None,
+                        prev_title: Optional[str] = None) -> List[str]:
+        """Rewrite adjacent sections in one call
+        
+        Falls back to one _enhance_transition call per section when the
+        reply cannot be split back into the same number of sections.
+        prev_title names the section before the window, whose text may be
+        only a headerless tail.
+        """
+        next_title = _extract_title(next_section) if next_section else 'Conclusion'
+        context = "".join([
+            f"Previous section ending (last {PREV_TAIL_CHARS} chars):\n",
+            prev_section[-PREV_TAIL_CHARS:] if prev_section else 'N/A',
+            f"\n\nNext section: {next_title}\n\nSections:\n",
+            f"\n{SECTION_SEP}\n".join(window),
+            "\n"
+        ])
+        messages = [
+            {"role": "system", "content": _LCE_WINDOW_INSTRUCTIONS},
+            {"role": "user", "content": context}
+        ]
+        
+        try:
+            content = _response_content(
+                self.wrapper.chat_completion(messages, model="sonnet")
+            )
+            parts = [p.strip() for p in content.split(SECTION_SEP) if p.strip()]
+            if len(parts) == len(window) and all(p.startswith('## ') for p in parts):
+                return parts
+            logger.warning("LCE window reply could not be split; enhancing per section")
+        except Exception as e:
+            logger.warning(f"LCE window enhancement failed: {e}")
+        
+        neighbours = [prev_section] + window + [next_section]
+        titles = [prev_title] + [_extract_title(section) for section in window] + [
+            _extract_title(next_section) if next_section else None
+        ]
+        return [
+            self._enhance_transition(
+                neighbours[j], window[j], neighbours[j + 2], titles=tuple(titles[j:j + 3])
+            )
+            for j in range(len(window))
+        ]
+    
+    async def _enhance_transition_async(self, prev_section: str, current_section: str,
+                                        next_section: Optional[str],
+                                        titles: Tuple[str, str, Optional[str]],
+                                        semaphore: asyncio.Semaphore) -> str:
+        """Run _enhance_transition in a worker thread, bounded by the semaphore"""
+        async with semaphore:
+            return await asyncio.to_thread(
+                self._enhance_transition, prev_section, current_section, next_section,
+                titles=titles
+            )
+    
     def _parse_sections(self, survey: str) -> List[str]:
         """Parse survey into sections"""
         # Split by section headers (##)
-        pattern = r'(?=^## )'
-        sections = re.split(pattern, survey, flags=re.MULTILINE)
+        sections = _SECTION_SPLIT_RE.split(survey)
         
         # Filter out empty sections
         sections = [s.strip() for s in sections if s.strip()]
@@ -80,56 +376,41 @@ class AutoSurveyLCE:
         return sections
     
     def _enhance_transition(self, prev_section: str, current_section: str, 
-                           next_section: str = None) -> str:
-        """Enhance transition between sections"""
+                           next_section: str = None,
+                           titles: Optional[Tuple[str, str, Optional[str]]] = None) -> str:
+        """Enhance transition between sections
+        
+        titles optionally carries the already parsed (prev, current, next)
+        section titles so they are not extracted again.
+        """
         
         # Extract section titles
-        def get_title(section):
-            lines = section.split('\n')
-            for line in lines:
-                if line.startswith('## '):
-                    return line.replace('## ', '').strip()
-            return "Section"
-        
-        prev_title = get_title(prev_section) if prev_section else None
-        current_title = get_title(current_section)
-        next_title = get_title(next_section) if next_section else None
-        
-        # Prepare context for enhancement
-        context = f"""
-Previous section: {prev_title if prev_title else 'Introduction'}
-Current section: {current_title}
-Next section: {next_title if next_title else 'Conclusion'}
-
-Task: Improve the coherence and flow of the current section by:
-1. Adding a smooth transition from the previous section
-2. Ensuring logical flow within the section
-3. If applicable, setting up the next section
-
-Current section content:
-{current_section}
-
-Previous section ending (last 200 chars):
-{prev_section[-200:] if prev_section else 'N/A'}
-"""
+        if titles is not None:
+            prev_title, current_title, next_title = titles
+        else:
+            prev_title = _extract_title(prev_section) if prev_section else None
+            current_title = _extract_title(current_section)
+            next_title = _extract_title(next_section) if next_section else None
+        
+        # Prepare context for enhancement; only this part varies per call
+        context = _LCE_CONTEXT_TMPL.format_map({
+            "prev_title": prev_title if prev_title else 'Introduction',
+            "current_title": current_title,
+            "next_title": next_title if next_title else 'Conclusion',
+            "current": current_section,
+            "prev_tail": prev_section[-PREV_TAIL_CHARS:] if prev_section else 'N/A'
+        })
         
         messages = [
-            {"role": "user", "content": f"""{context}
-
-Please rewrite the current section with improved transitions and coherence. 
-Keep the same structure and content, but improve the flow and connections.
-Return ONLY the enhanced section text, starting with the section header."""}
+            {"role": "system", "content": _LCE_INSTRUCTIONS},
+            {"role": "user", "content": context}
         ]
         
         try:
             response = self.wrapper.chat_completion(messages, model="sonnet")
-            enhanced = response.strip()
             
             # Ensure section header is preserved
-            if not enhanced.startswith('## '):
-                enhanced = current_section  # Fallback to original
-            
-            return enhanced
+            return _section_from_response(_response_content(response), current_section)
             
         except Exception as e:
             logger.warning(f"LCE enhancement failed: {e}")
@@ -139,36 +420,13 @@ Return ONLY the enhanced section text, starting with the section header."""}
                                next_context: str = None) -> str:
         """Add transition phrases to improve flow"""
         
-        transitions = {
-            'building': [
-                "Building on the previous discussion, ",
-                "Extending these concepts, ",
-                "Following this foundation, "
-            ],
-            'contrast': [
-                "In contrast to the previous approach, ",
-                "However, ",
-                "Alternatively, "
-            ],
-            'continuation': [
-                "Furthermore, ",
-                "Additionally, ",
-                "Moreover, "
-            ],
-            'conclusion': [
-                "In summary, ",
-                "To conclude this section, ",
-                "These findings suggest that "
-            ]
-        }
-        
         # Simple heuristic to add transitions
         lines = section.split('\n')
         
         # Add opening transition if not present
-        if len(lines) > 2 and not any(trans in lines[2] for trans_list in transitions.values() for trans in trans_list):
+        if len(lines) > 2 and not _TRANSITION_RE.search(lines[2]):
             # Add after header and blank line
             if prev_context:
-                lines.insert(2, transitions['building'][0])
+                lines.insert(2, _TRANSITIONS['building'][0])
         
         return '\n'.join(lines)
\ No newline at end of file
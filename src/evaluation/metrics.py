@@ -4,21 +4,176 @@ Measures citation quality, content quality, and performance.
 """
 
 import re
+import copy
 import time
 import json
 import logging
-from typing import List, Dict, Tuple, Optional
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Dict, Tuple, Optional, Set
 from dataclasses import dataclass
 import numpy as np
 from pathlib import Path
 
-logging.basicConfig(level=logging.INFO)
+# Optional C-level multi-pattern matcher; regex alternations are used otherwise
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional SIMD multi-literal scanner; preferred over Aho-Corasick when present
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Optional fast JSON codec; stdlib json is used otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Patterns used on every sentence of every section; compiled once at import
+# Sentences end at [.!?]; mapping '!' and '?' to '.' (length-preserving) lets
+# C-level str.split replace the regex split
+_SENT_TABLE = str.maketrans('!?', '..')
+_CITATION_RE = re.compile(r'\[\d+\]|\[[\w\s]+,?\s*\d{4}\]')
+# [Author, year] citations as found within one sentence; excluding [.!?] means
+# matches over a whole section never straddle a sentence boundary
+_CITATION_RE2 = re.compile(r'\[([^,\].!?]+),\s*(\d{4}|\d{2})\]')
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
 
-@dataclass
-class CitationMetrics:
+# Static judge instructions, sent as the system prompt so the prefix is
+# identical across calls and can be served from the prompt cache
+_JUDGE_RUBRIC = """You evaluate academic surveys on the following criteria (1-5 scale):
+1. Coverage: How comprehensive is the topic coverage?
+2. Coherence: How well do ideas flow and connect?
+3. Structure: How well organized is the survey?
+4. Insights: Quality of analysis and synthesis
+
+Respond only with the requested JSON scores."""
+
+TRANSITION_PHRASES = (
+    'furthermore', 'moreover', 'however', 'therefore', 'consequently',
+    'in addition', 'on the other hand', 'as a result', 'building on',
+    'this leads to', 'following this'
+)
+INSIGHT_KEYWORDS = (
+    'synthesis', 'analysis', 'comparison', 'contrast', 'trend',
+    'pattern', 'implication', 'significance', 'contribution',
+    'limitation', 'challenge', 'opportunity'
+)
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _split_sentences(text: str) -> List[str]:
+    """Split text on runs of [.!?], dropping the empty pieces between delimiters."""
+    return [piece for piece in text.translate(_SENT_TABLE).split('.') if piece]
+
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """Return (start, end) offsets of the non-empty sentences of text."""
+    spans = []
+    start = 0
+    for piece in text.translate(_SENT_TABLE).split('.'):
+        end = start + len(piece)
+        if piece:
+            spans.append((start, end))
+        start = end + 1
+    return spans
+
+
+def _section_texts(survey: Dict) -> Tuple[List[str], List[str]]:
+    """Normalize sections (dicts or SurveySection objects) to original and lowercased content."""
+    contents = [
+        section.get('content', '') if isinstance(section, dict) else section.content
+        for section in survey.get('sections', [])
+    ]
+    return contents, [content.lower() for content in contents]
+
+
+def _present_substrings(keys: List[str], text: str) -> Set[str]:
+    """Return the keys occurring in text via hashed fixed-width window sets.
+    
+    Keys are grouped by length so each group costs one O(len(text)) pass of
+    set inserts instead of one substring scan per key.
+    """
+    by_length = defaultdict(set)
+    for key in keys:
+        by_length[len(key)].add(key)
+        
+    present = set()
+    for length, group in by_length.items():
+        if length == 0 or len(group) == 1:
+            present.update(key for key in group if key in text)
+            continue
+        windows = {text[i:i + length] for i in range(len(text) - length + 1)}
+        present.update(group & windows)
+    return present
+
+
+def _build_automaton(keys) -> Optional['ahocorasick.Automaton']:
+    """Build an Aho-Corasick automaton over non-empty keys (None if unavailable)."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for key in keys:
+        if key:
+            automaton.add_word(key, key)
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_keyword_database() -> Optional['hyperscan.Database']:
+    """Compile transition phrases and insight keywords into one Hyperscan database.
+    
+    Pattern ids below len(TRANSITION_PHRASES) are transitions, the rest insights.
+    Returns None when Hyperscan is unavailable.
+    """
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    keywords = TRANSITION_PHRASES + INSIGHT_KEYWORDS
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    database.compile(
+        expressions=[re.escape(keyword).encode() for keyword in keywords],
+        ids=list(range(len(keywords))),
+        elements=len(keywords),
+        flags=[0] * len(keywords)
+    )
+    return database
+
+
+class _FrozenSlots:
+    """Pickle/copy support for frozen dataclasses declaring __slots__.
+    
+    dataclass(slots=True) needs Python 3.10+, so metric containers list their
+    slots explicitly; frozen instances cannot be restored through setattr,
+    hence the explicit state hooks.
+    """
+    __slots__ = ()
+    
+    def __getstate__(self) -> List:
+        return [getattr(self, name) for name in self.__slots__]
+    
+    def __setstate__(self, state: List):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+@dataclass(frozen=True)
+class CitationMetrics(_FrozenSlots):
     """Metrics for citation quality."""
+    __slots__ = ('precision', 'recall', 'f1_score', 'total_claims', 'cited_claims', 'total_citations')
     precision: float  # % of citations that are relevant
     recall: float     # % of claims with citations
     f1_score: float   # Harmonic mean of precision and recall
@@ -30,17 +185,28 @@ class CitationMetrics:
 class SurveyEvaluator:
     """Comprehensive evaluator for survey quality"""
     
+    # Weights for coverage, coherence, structure, citations, insights
+    _OVERALL_WEIGHTS = np.array([0.25, 0.20, 0.20, 0.20, 0.15], dtype=np.float64)
+    
     def __init__(self, claude_wrapper=None):
         self.wrapper = claude_wrapper
     
-    def evaluate_survey(self, survey: str, papers: List[Dict]) -> Dict:
-        """Evaluate survey across multiple dimensions"""
+    def evaluate_survey(
+        self,
+        survey: str,
+        papers: List[Dict],
+        content_scores: Optional[Dict[str, float]] = None
+    ) -> Dict:
+        """Evaluate survey across multiple dimensions.
+        
+        Pass content_scores (e.g. from evaluate_surveys) to skip the LLM call.
+        """
         
         # Calculate citation metrics
         citation_metrics = self._evaluate_citations(survey, papers)
         
         # Evaluate content quality (requires LLM)
-        if not self.wrapper:
+        if not self.wrapper and content_scores is None:
             # Return only citation metrics if no LLM available
             return {
                 'overall': citation_metrics.f1_score * 5,  # Scale to 1-5
@@ -55,7 +221,8 @@ class SurveyEvaluator:
                 'raw_citation_metrics': citation_metrics
             }
         
-        content_scores = self._evaluate_content(survey)
+        if content_scores is None:
+            content_scores = self._evaluate_content(survey)
         
         # Calculate overall score
         overall = self._calculate_overall_score(citation_metrics, content_scores)
@@ -73,20 +240,42 @@ class SurveyEvaluator:
             'raw_citation_metrics': citation_metrics
         }
     
+    def evaluate_surveys(self, surveys: Dict[str, str], papers: List[Dict]) -> Dict[str, Dict]:
+        """
+        Evaluate several surveys, scoring content with a single LLM call.
+        
+        Args:
+            surveys: Dict mapping method name to survey text
+            papers: Source papers
+            
+        Returns:
+            Dict mapping method name to evaluate_survey results
+        """
+        batch_scores = self._evaluate_content_batch(surveys) if self.wrapper and surveys else {}
+        return {
+            name: self.evaluate_survey(survey, papers, content_scores=batch_scores.get(name))
+            for name, survey in surveys.items()
+        }
+    
     def _evaluate_citations(self, survey: str, papers: List[Dict]) -> CitationMetrics:
         """Evaluate citation quality"""
         # Count claims (sentences that make assertions)
-        sentences = re.split(r'[.!?]+', survey)
-        claim_sentences = [s for s in sentences if len(s.strip()) > 20 and not s.strip().startswith('#')]
-        total_claims = len(claim_sentences)
+        sentences = _split_sentences(survey)
+        stripped = [s.strip() for s in sentences]
+        lengths = np.fromiter(map(len, stripped), dtype=np.int64, count=len(stripped))
+        headings = np.fromiter((s.startswith('#') for s in stripped), dtype=bool, count=len(stripped))
+        claim_mask = (lengths > 20) & ~headings
+        claim_sentences = np.asarray(sentences, dtype=object)[claim_mask]
+        total_claims = int(claim_mask.sum())
         
         # Count citations
-        citation_pattern = r'\[\d+\]|\[[\w\s]+,?\s*\d{4}\]'
-        citations = re.findall(citation_pattern, survey)
-        total_citations = len(citations)
+        total_citations = sum(1 for _ in _CITATION_RE.finditer(survey))
         
         # Estimate cited claims
-        cited_claims = sum(1 for s in claim_sentences if re.search(citation_pattern, s))
+        cited_claims = int(np.fromiter(
+            (_CITATION_RE.search(s) is not None for s in claim_sentences),
+            dtype=bool, count=total_claims
+        ).sum())
         
         # Calculate metrics
         recall = cited_claims / total_claims if total_claims > 0 else 0
@@ -107,67 +296,116 @@ class SurveyEvaluator:
         if not self.wrapper:
             raise ValueError("Claude wrapper required for content evaluation. Please provide wrapper instance.")
             
-        prompt = f"""Evaluate this survey on the following criteria (1-5 scale):
-1. Coverage: How comprehensive is the topic coverage?
-2. Coherence: How well do ideas flow and connect?
-3. Structure: How well organized is the survey?
-4. Insights: Quality of analysis and synthesis
-
-Survey:
+        prompt = f"""Survey:
 {survey[:3000]}...
 
 Provide scores as JSON: {{"coverage": X, "coherence": X, "structure": X, "insights": X}}"""
         
-        messages = [{"role": "user", "content": prompt}]
+        messages = [
+            {"role": "system", "content": _JUDGE_RUBRIC},
+            {"role": "user", "content": prompt}
+        ]
         response = self.wrapper.chat_completion(messages, model="haiku")
         
-        # Parse JSON response
-        import json
         try:
-            if isinstance(response, str):
-                # Extract JSON from response if wrapped in text
-                import re
-                json_match = re.search(r'\{.*\}', response)
-                if json_match:
-                    scores = json.loads(json_match.group())
-                else:
-                    raise ValueError("No JSON found in response")
-            else:
-                scores = json.loads(response)
-                
-            # Validate scores are in correct range
-            for key in ['coverage', 'coherence', 'structure', 'insights']:
-                if key not in scores or not (1 <= scores[key] <= 5):
-                    raise ValueError(f"Invalid score for {key}")
-                    
+            scores = self._parse_json_response(response)
+            self._validate_scores(scores)
             return scores
-        except Exception as e:
+        except (ValueError, KeyError, IndexError, TypeError) as e:
             raise ValueError(f"Failed to parse evaluation scores: {e}")
     
+    def _evaluate_content_batch(self, surveys: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+        """Score several surveys in one LLM round-trip, keyed by survey name"""
+        if not self.wrapper:
+            raise ValueError("Claude wrapper required for content evaluation. Please provide wrapper instance.")
+            
+        excerpts = "\n\n".join(
+            f'=== Survey "{name}" ===\n{survey[:3000]}...'
+            for name, survey in surveys.items()
+        )
+        prompt = f"""Evaluate each of the following surveys.
+
+{excerpts}
+
+Provide scores as a single JSON object keyed by survey name:
+{{"<name>": {{"coverage": X, "coherence": X, "structure": X, "insights": X}}, ...}}"""
+        
+        messages = [
+            {"role": "system", "content": _JUDGE_RUBRIC},
+            {"role": "user", "content": prompt}
+        ]
+        response = self.wrapper.chat_completion(messages, model="haiku")
+        
+        try:
+            all_scores = self._parse_json_response(response)
+            for name in surveys:
+                if name not in all_scores:
+                    raise ValueError(f"Missing scores for {name}")
+                self._validate_scores(all_scores[name])
+            return {name: all_scores[name] for name in surveys}
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Failed to parse evaluation scores: {e}")
+    
+    @staticmethod
+    def _parse_json_response(response) -> Dict:
+        """Parse the JSON object from a judge response.
+        
+        Accepts raw text or the wrapper's OpenAI-style response dict. Tries the
+        outermost {...} blob first, then decodes from each '{' in turn so
+        braces in surrounding prose do not break parsing. Raises ValueError
+        if no JSON object can be decoded.
+        """
+        if isinstance(response, dict):
+            if "error" in response:
+                raise ValueError(f"API Error: {response['error']}")
+            response = response["choices"][0]["message"]["content"]
+        if isinstance(response, bytes):
+            response = response.decode('utf-8')
+            
+        # Extract JSON from response if wrapped in text
+        json_match = _JSON_OBJECT_RE.search(response)
+        if not json_match:
+            raise ValueError("No JSON found in response")
+        try:
+            return _json_loads(json_match.group())
+        except ValueError:
+            pass
+            
+        start = json_match.start()
+        while start != -1:
+            try:
+                parsed, _ = _JSON_DECODER.raw_decode(response, start)
+                if isinstance(parsed, dict):
+                    return parsed
+            except ValueError:
+                pass
+            start = response.find('{', start + 1)
+        raise ValueError("No valid JSON object found in response")
+    
+    @staticmethod
+    def _validate_scores(scores: Dict) -> None:
+        """Validate scores are in correct range"""
+        for key in ['coverage', 'coherence', 'structure', 'insights']:
+            if key not in scores or not (1 <= scores[key] <= 5):
+                raise ValueError(f"Invalid score for {key}")
+    
     def _calculate_overall_score(self, citations: CitationMetrics, content: Dict) -> float:
         """Calculate weighted overall score"""
-        weights = {
-            'coverage': 0.25,
-            'coherence': 0.20,
-            'structure': 0.20,
-            'citations': 0.20,
-            'insights': 0.15
-        }
-        
-        score = (
-            weights['coverage'] * content.get('coverage', 3.5) +
-            weights['coherence'] * content.get('coherence', 3.5) +
-            weights['structure'] * content.get('structure', 3.5) +
-            weights['citations'] * (citations.f1_score * 5) +  # Convert to 1-5 scale
-            weights['insights'] * content.get('insights', 3.5)
-        )
+        values = np.array([
+            content.get('coverage', 3.5),
+            content.get('coherence', 3.5),
+            content.get('structure', 3.5),
+            citations.f1_score * 5,  # Convert to 1-5 scale
+            content.get('insights', 3.5)
+        ], dtype=np.float64)
         
-        return min(5.0, score)  # Cap at 5.0
+        return min(5.0, float(self._OVERALL_WEIGHTS @ values))  # Cap at 5.0
 
 
-@dataclass
-class ContentMetrics:
+@dataclass(frozen=True)
+class ContentMetrics(_FrozenSlots):
     """Metrics for content quality."""
+    __slots__ = ('coverage_score', 'coherence_score', 'structure_score', 'insights_score', 'overall_score')
     coverage_score: float      # 1-5 scale
     coherence_score: float     # 1-5 scale  
     structure_score: float     # 1-5 scale
@@ -175,9 +413,13 @@ class ContentMetrics:
     overall_score: float       # Weighted average
     
 
-@dataclass
-class PerformanceMetrics:
+@dataclass(frozen=True)
+class PerformanceMetrics(_FrozenSlots):
     """Performance and resource metrics."""
+    __slots__ = (
+        'total_time_seconds', 'iterations', 'converged',
+        'api_calls', 'estimated_tokens', 'estimated_cost_usd'
+    )
     total_time_seconds: float
     iterations: int
     converged: bool
@@ -186,42 +428,105 @@ class PerformanceMetrics:
     estimated_cost_usd: float
 
 
+@dataclass
+class SurveyIndex:
+    """Text-derived intermediates of a sectioned survey, parsed once and
+    shared by the citation and content evaluators.
+    
+    Offsets index into full_text; sentence_spans and citation_matches are
+    grouped per section so nothing straddles a section boundary.
+    """
+    full_text: str                                      # Section contents concatenated
+    full_text_lower: str                                # Lowercased sections concatenated
+    section_offsets: List[Tuple[int, int]]              # (start, end) of each section
+    sections_lower: List[str]                           # Lowercased content per section
+    sentence_spans: List[List[Tuple[int, int]]]         # Sentence (start, end) per section
+    citation_matches: List[List[Tuple[int, Tuple[str, str]]]]  # (start, (author, year)) per section
+    word_count: int                                     # Whitespace-delimited words, summed per section
+    
+    @property
+    def section_count(self) -> int:
+        return len(self.section_offsets)
+    
+    @classmethod
+    def build(cls, survey: Dict) -> 'SurveyIndex':
+        """Parse a survey dict whose sections are dicts or SurveySection objects."""
+        contents, sections_lower = _section_texts(survey)
+        full_text = ''.join(contents)
+        
+        section_offsets = []
+        sentence_spans = []
+        citation_matches = []
+        start = 0
+        for content in contents:
+            end = start + len(content)
+            section_offsets.append((start, end))
+            sentence_spans.append([
+                (start + a, start + b) for a, b in _sentence_spans(content)
+            ])
+            citation_matches.append([
+                (m.start(), m.groups()) for m in _CITATION_RE2.finditer(full_text, start, end)
+            ])
+            start = end
+            
+        return cls(
+            full_text=full_text,
+            full_text_lower=''.join(sections_lower),
+            section_offsets=section_offsets,
+            sections_lower=sections_lower,
+            sentence_spans=sentence_spans,
+            citation_matches=citation_matches,
+            # One C-level split; the space join keeps words from merging across sections
+            word_count=len(' '.join(contents).split())
+        )
+
+
 class CitationEvaluator:
     """Evaluate citation quality in surveys."""
     
-    def evaluate_citations(self, survey: Dict, papers: List[Dict]) -> CitationMetrics:
+    def evaluate_citations(
+        self,
+        survey: Dict,
+        papers: List[Dict],
+        index: Optional[SurveyIndex] = None
+    ) -> CitationMetrics:
         """
         Evaluate citation quality metrics.
         
         Args:
             survey: Survey with sections
             papers: Source papers
+            index: Pre-built SurveyIndex for survey (built here if omitted)
             
         Returns:
             CitationMetrics with precision, recall, F1
         """
+        if index is None:
+            index = SurveyIndex.build(survey)
+        text = index.full_text
+            
         # Extract all claims (simplified: sentences ending with citation)
         all_claims = []
         cited_claims = []
         all_citations = []
         
-        for section in survey.get('sections', []):
-            content = section.get('content', '') if isinstance(section, dict) else section.content
+        for spans, matches in zip(index.sentence_spans, index.citation_matches):
+            # Merge the section's citation offsets into its sentence spans
+            pos = 0
             
-            # Split into sentences
-            sentences = re.split(r'[.!?]+', content)
-            
-            for sentence in sentences:
+            for start, end in spans:
+                first = pos
+                while pos < len(matches) and matches[pos][0] < end:
+                    pos += 1
+                    
+                sentence = text[start:end]
                 if len(sentence.strip()) > 20:  # Filter out very short fragments
                     all_claims.append(sentence)
                     
                     # Check if sentence has citation
-                    citation_pattern = r'\[([^,\]]+),\s*(\d{4}|\d{2}|n\.d\.)\]'
-                    citations = re.findall(citation_pattern, sentence)
-                    
-                    if citations:
+                    if pos > first:
                         cited_claims.append(sentence)
-                        all_citations.extend(citations)
+                        all_citations.extend(groups for _, groups in matches[first:pos])
                         
         # Calculate metrics
         total_claims = len(all_claims)
@@ -251,32 +556,87 @@ class CitationEvaluator:
 class ContentEvaluator:
     """Evaluate content quality of surveys."""
     
-    def evaluate_content(self, survey: Dict, papers: List[Dict]) -> ContentMetrics:
+    def __init__(self):
+        self._keyword_db = _build_keyword_database()
+        self._transition_ac = _build_automaton(TRANSITION_PHRASES)
+        self._insight_ac = _build_automaton(INSIGHT_KEYWORDS)
+        
+    def __getstate__(self) -> Dict:
+        # Hyperscan databases cannot be pickled; rebuild in worker processes
+        state = self.__dict__.copy()
+        state['_keyword_db'] = None
+        return state
+        
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._keyword_db = _build_keyword_database()
+        
+    def _keyword_counts(self, index: SurveyIndex) -> Tuple[int, int]:
+        """Count (transition phrases, insight keywords) across all sections."""
+        if self._keyword_db is None:
+            return (
+                sum(self._count_matches(c, self._transition_ac, TRANSITION_PHRASES) for c in index.sections_lower),
+                sum(self._count_matches(c, self._insight_ac, INSIGHT_KEYWORDS) for c in index.sections_lower)
+            )
+            
+        # One SIMD scan per section covers both keyword families
+        num_transitions = len(TRANSITION_PHRASES)
+        counts = [0, 0]
+        
+        def on_match(pattern_id, start, end, flags, context):
+            counts[pattern_id >= num_transitions] += 1
+            
+        for content in index.sections_lower:
+            self._keyword_db.scan(content.encode('utf-8'), match_event_handler=on_match)
+        return counts[0], counts[1]
+        
+    @staticmethod
+    def _count_matches(text: str, automaton, phrases: Tuple[str, ...]) -> int:
+        """Count keyword occurrences, including phrases that overlap each other."""
+        if automaton is not None:
+            return sum(1 for _ in automaton.iter(text))
+        # A regex alternation would miss overlaps such as "building on the
+        # other hand", so fall back to one substring count per phrase
+        return sum(map(text.count, phrases))
+        
+    def evaluate_content(
+        self,
+        survey: Dict,
+        papers: List[Dict],
+        index: Optional[SurveyIndex] = None
+    ) -> ContentMetrics:
         """
         Evaluate content quality metrics.
         
         Args:
             survey: Survey to evaluate
             papers: Source papers
+            index: Pre-built SurveyIndex for survey (built here if omitted)
             
         Returns:
             ContentMetrics with quality scores
         """
+        if index is None:
+            index = SurveyIndex.build(survey)
+            
         # For simplified evaluation, use heuristics
         # In practice, would use Claude for more sophisticated evaluation
         
         # Coverage: based on number of papers referenced
-        papers_referenced = self._count_referenced_papers(survey, papers)
+        papers_referenced = self._count_referenced_papers(index, papers)
         coverage_score = min(5.0, 1.0 + (papers_referenced / len(papers)) * 4) if papers else 3.0
         
+        # Transition and insight keywords are counted together in one pass
+        transition_count, keyword_count = self._keyword_counts(index)
+        
         # Coherence: check for transition phrases
-        coherence_score = self._evaluate_coherence(survey)
+        coherence_score = self._evaluate_coherence(index, transition_count)
         
         # Structure: based on section organization
-        structure_score = self._evaluate_structure(survey)
+        structure_score = self._evaluate_structure(index)
         
         # Insights: based on synthesis keywords
-        insights_score = self._evaluate_insights(survey)
+        insights_score = self._evaluate_insights(index, keyword_count)
         
         # Overall score (weighted average)
         overall_score = (
@@ -294,37 +654,27 @@ class ContentEvaluator:
             overall_score=overall_score
         )
         
-    def _count_referenced_papers(self, survey: Dict, papers: List[Dict]) -> int:
+    def _count_referenced_papers(self, index: SurveyIndex, papers: List[Dict]) -> int:
         """Count how many papers are referenced in the survey."""
-        survey_text = ""
-        for section in survey.get('sections', []):
-            content = section.get('content', '') if isinstance(section, dict) else section.content
-            survey_text += content
-            
-        referenced = 0
-        for paper in papers:
+        survey_text = index.full_text
+        prefixes = [paper.get('title', '')[:50] for paper in papers]
+        automaton = _build_automaton(prefixes)
+        if automaton is None:
             # Check if paper title or key terms appear
-            if paper.get('title', '')[:50] in survey_text:
-                referenced += 1
-                
-        return referenced
+            found = _present_substrings(prefixes, survey_text)
+            return sum(1 for prefix in prefixes if prefix in found)
+            
+        # Single scan of the survey text for all title prefixes at once
+        found = {key for _, key in automaton.iter(survey_text)}
+        return sum(1 for prefix in prefixes if not prefix or prefix in found)
         
-    def _evaluate_coherence(self, survey: Dict) -> float:
+    def _evaluate_coherence(self, index: SurveyIndex, transition_count: Optional[int] = None) -> float:
         """Evaluate coherence based on transition phrases."""
-        transition_phrases = [
-            'furthermore', 'moreover', 'however', 'therefore', 'consequently',
-            'in addition', 'on the other hand', 'as a result', 'building on',
-            'this leads to', 'following this'
-        ]
-        
-        transition_count = 0
-        for section in survey.get('sections', []):
-            content = section.get('content', '').lower() if isinstance(section, dict) else section.content.lower()
-            for phrase in transition_phrases:
-                transition_count += content.count(phrase)
+        if transition_count is None:
+            transition_count = self._keyword_counts(index)[0]
                 
         # Score based on transition density
-        sections_count = len(survey.get('sections', []))
+        sections_count = index.section_count
         if sections_count > 0:
             avg_transitions = transition_count / sections_count
             score = min(5.0, 2.0 + avg_transitions * 0.5)
@@ -333,11 +683,12 @@ class ContentEvaluator:
             
         return score
         
-    def _evaluate_structure(self, survey: Dict) -> float:
+    def _evaluate_structure(self, index: SurveyIndex) -> float:
         """Evaluate structural organization."""
-        sections = survey.get('sections', [])
+        sections = index.sections_lower
+        num_sections = len(sections)
         
-        if not sections:
+        if num_sections == 0:
             return 2.0
             
         # Check for logical progression
@@ -348,43 +699,30 @@ class ContentEvaluator:
         
         score = 3.0  # Base score
         
-        # Check first section
-        first_content = sections[0].get('content', '').lower() if isinstance(sections[0], dict) else sections[0].content.lower()
-        if any(kw in first_content[:200] for kw in expected_keywords[0]):
+        # Bonus for good number of sections (no text needed)
+        if 4 <= num_sections <= 8:
+            score += 1.0
+        
+        # Check first section (bounded find avoids copying a 200-char prefix)
+        first_content = sections[0]
+        if any(first_content.find(kw, 0, 200) != -1 for kw in expected_keywords[0]):
             score += 0.5
             
         # Check last section
-        if len(sections) > 1:
-            last_content = sections[-1].get('content', '').lower() if isinstance(sections[-1], dict) else sections[-1].content.lower()
+        if num_sections > 1:
+            last_content = sections[-1]
             if any(kw in last_content for kw in expected_keywords[-1]):
                 score += 0.5
-                
-        # Bonus for good number of sections
-        if 4 <= len(sections) <= 8:
-            score += 1.0
             
         return min(5.0, score)
         
-    def _evaluate_insights(self, survey: Dict) -> float:
+    def _evaluate_insights(self, index: SurveyIndex, keyword_count: Optional[int] = None) -> float:
         """Evaluate synthesis and insights."""
-        insight_keywords = [
-            'synthesis', 'analysis', 'comparison', 'contrast', 'trend',
-            'pattern', 'implication', 'significance', 'contribution',
-            'limitation', 'challenge', 'opportunity'
-        ]
-        
-        keyword_count = 0
-        for section in survey.get('sections', []):
-            content = section.get('content', '').lower() if isinstance(section, dict) else section.content.lower()
-            for keyword in insight_keywords:
-                keyword_count += content.count(keyword)
+        if keyword_count is None:
+            keyword_count = self._keyword_counts(index)[1]
                 
         # Score based on insight density
-        total_words = sum(
-            len(section.get('content', '').split()) if isinstance(section, dict) 
-            else len(section.content.split())
-            for section in survey.get('sections', [])
-        )
+        total_words = index.word_count
         
         if total_words > 0:
             insight_density = keyword_count / (total_words / 100)  # Per 100 words
@@ -439,13 +777,95 @@ class PerformanceEvaluator:
         )
 
 
+def _evaluate_one(
+    method_name: str,
+    survey: Dict,
+    papers: List[Dict],
+    timing: Optional[Tuple[float, float]],
+    citation_eval: 'CitationEvaluator',
+    content_eval: 'ContentEvaluator',
+    performance_eval: 'PerformanceEvaluator'
+) -> Dict:
+    """Evaluate one method's survey; module-level so worker processes can run it."""
+    logger.info("Evaluating %s", method_name)
+    
+    # Parse the survey text once for all evaluators
+    index = SurveyIndex.build(survey)
+    
+    # Citation metrics
+    citation_metrics = citation_eval.evaluate_citations(survey, papers, index)
+    
+    # Content metrics
+    content_metrics = content_eval.evaluate_content(survey, papers, index)
+    
+    # Performance metrics
+    if timing:
+        start, end = timing
+        performance_metrics = performance_eval.evaluate_performance(
+            start, end, survey
+        )
+    else:
+        performance_metrics = PerformanceMetrics(
+            total_time_seconds=0,
+            iterations=survey.get('total_iterations', 1),
+            converged=survey.get('converged', False),
+            api_calls=0,
+            estimated_tokens=0,
+            estimated_cost_usd=0
+        )
+        
+    return {
+        'citation': {
+            'precision': citation_metrics.precision,
+            'recall': citation_metrics.recall,
+            'f1_score': citation_metrics.f1_score
+        },
+        'content': {
+            'coverage': content_metrics.coverage_score,
+            'coherence': content_metrics.coherence_score,
+            'structure': content_metrics.structure_score,
+            'insights': content_metrics.insights_score,
+            'overall': content_metrics.overall_score
+        },
+        'performance': {
+            'time_seconds': performance_metrics.total_time_seconds,
+            'iterations': performance_metrics.iterations,
+            'converged': performance_metrics.converged
+        }
+    }
+
+
 class SurveyComparator:
     """Compare different survey generation approaches."""
     
-    def __init__(self):
+    # Maximum number of memoized per-method evaluations
+    CACHE_SIZE = 128
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Worker processes for evaluating methods in parallel
+                (defaults to None, which like 1 evaluates serially in-process;
+                process startup and pickling outweigh the regex and keyword
+                scoring for typical surveys)
+        """
         self.citation_eval = CitationEvaluator()
         self.content_eval = ContentEvaluator()
         self.performance_eval = PerformanceEvaluator()
+        self.max_workers = max_workers
+        self._cache: Dict[Tuple, Dict] = {}
+        
+    @staticmethod
+    def _cache_key(survey: Dict, papers_key: Tuple, timing: Optional[Tuple[float, float]]) -> Tuple:
+        """Key covering every input that _evaluate_one's results depend on."""
+        contents, _ = _section_texts(survey)
+        return (
+            tuple(contents),
+            papers_key,
+            tuple(timing) if timing else None,
+            survey.get('total_iterations', 1),
+            survey.get('converged', False)
+        )
         
     def compare_surveys(
         self,
@@ -456,6 +876,9 @@ class SurveyComparator:
         """
         Compare multiple surveys.
         
+        Identical surveys (by section content, papers and timing) are evaluated
+        once and memoized across calls.
+        
         Args:
             surveys: Dict mapping method name to survey
             papers: Source papers
@@ -464,52 +887,52 @@ class SurveyComparator:
         Returns:
             Comparison results
         """
-        results = {}
+        evaluate = partial(
+            _evaluate_one,
+            citation_eval=self.citation_eval,
+            content_eval=self.content_eval,
+            performance_eval=self.performance_eval
+        )
+        papers_key = tuple(
+            (paper.get('title', '')[:50], str(paper.get('year', 'n.d.')))
+            for paper in papers
+        )
+        names = list(surveys)
+        timings = {name: timing_data.get(name) if timing_data else None for name in names}
+        keys = {name: self._cache_key(surveys[name], papers_key, timings[name]) for name in names}
         
-        for method_name, survey in surveys.items():
-            logger.info(f"Evaluating {method_name}")
-            
-            # Citation metrics
-            citation_metrics = self.citation_eval.evaluate_citations(survey, papers)
-            
-            # Content metrics
-            content_metrics = self.content_eval.evaluate_content(survey, papers)
+        # Evaluate each distinct uncached survey once
+        pending = {}
+        for name in names:
+            if keys[name] not in self._cache and keys[name] not in pending:
+                pending[keys[name]] = name
+        todo = list(pending.values())
+        
+        # Methods are independent, so fan out across processes when asked to
+        workers = min(len(todo), self.max_workers or 1)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                evaluated = list(executor.map(
+                    evaluate, todo, [surveys[name] for name in todo],
+                    [papers] * len(todo), [timings[name] for name in todo]
+                ))
+        else:
+            evaluated = [
+                evaluate(name, surveys[name], papers, timings[name])
+                for name in todo
+            ]
             
-            # Performance metrics
-            if timing_data and method_name in timing_data:
-                start, end = timing_data[method_name]
-                performance_metrics = self.performance_eval.evaluate_performance(
-                    start, end, survey
-                )
-            else:
-                performance_metrics = PerformanceMetrics(
-                    total_time_seconds=0,
-                    iterations=survey.get('total_iterations', 1),
-                    converged=survey.get('converged', False),
-                    api_calls=0,
-                    estimated_tokens=0,
-                    estimated_cost_usd=0
-                )
-                
-            results[method_name] = {
-                'citation': {
-                    'precision': citation_metrics.precision,
-                    'recall': citation_metrics.recall,
-                    'f1_score': citation_metrics.f1_score
-                },
-                'content': {
-                    'coverage': content_metrics.coverage_score,
-                    'coherence': content_metrics.coherence_score,
-                    'structure': content_metrics.structure_score,
-                    'insights': content_metrics.insights_score,
-                    'overall': content_metrics.overall_score
-                },
-                'performance': {
-                    'time_seconds': performance_metrics.total_time_seconds,
-                    'iterations': performance_metrics.iterations,
-                    'converged': performance_metrics.converged
-                }
-            }
+        fresh = {keys[name]: result for name, result in zip(todo, evaluated)}
+        results = {
+            name: copy.deepcopy(fresh[keys[name]] if keys[name] in fresh else self._cache[keys[name]])
+            for name in names
+        }
+        
+        # Remember new evaluations, evicting the oldest beyond CACHE_SIZE
+        for key, result in fresh.items():
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = result
             
         # Calculate improvements
         if 'autosurvey' in results and 'iterative' in results:
@@ -658,8 +1081,14 @@ def test_evaluation():
     output_file = Path("data/evaluation/test_results.json")
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    if ORJSON_AVAILABLE:
+        output_file.write_bytes(orjson.dumps(
+            results,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        ))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(results, f, indent=2)
         
     print(f"\nResults saved to {output_file}")
     
@@ -667,4 +1096,5 @@ def test_evaluation():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     test_evaluation()
\ No newline at end of file
@@ -3,24 +3,177 @@ Global Iterative Improvement System
 Our novel approach using global verification-driven iteration for survey generation.
 """
 
+import io
 import os
 import sys
+import re
 import json
+import copy
+import gzip
 import time
+import uuid
+import asyncio
+import hashlib
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass, field
-import pickle
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict, is_dataclass
 
-# Add parent directories to path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+# Optional fast JSON codec for responses and checkpoints; stdlib json is used otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Add parent directories to path (once, even if this module is reloaded)
+_PROJECT_ROOT = str(Path(__file__).parent.parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 from src.wrappers.claude_wrapper import EnhancedClaudeWrapper
 from src.baselines.autosurvey import AutoSurveyBaseline, SurveySection
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Outermost {...} span of an LLM response; compiled once at import
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Static instructions go in the system prompt so the identical prefix is reused
+# (and prompt-cached by the backend) across iterations; per-call content is
+# appended last in the user message.
+_VERIFICATION_RUBRIC = """You are an expert survey evaluator assessing academic survey quality.
+
+Evaluate the survey globally on a 1-5 scale for each criterion:
+1. Coverage: Does the survey comprehensively cover the topic?
+2. Structure: Is the survey well-organized with logical flow?
+3. Coherence: Are sections connected with smooth transitions?
+4. Citations: Are claims properly supported with citations?
+5. Insights: Does the survey provide valuable synthesis and insights?
+
+Respond in JSON format:
+{
+    "coverage_score": 0.0,
+    "structure_score": 0.0,
+    "coherence_score": 0.0,
+    "citation_score": 0.0,
+    "insights_score": 0.0,
+    "critical_issues": ["issue1", "issue2"],
+    "improvement_suggestions": ["suggestion1", "suggestion2"]
+}"""
+
+_COVERAGE_INSTRUCTIONS = """You are an expert at identifying gaps in survey coverage.
+
+Identify 2-3 important topics missing from the survey you are given and add 1-2 paragraphs covering the most important missing topics.
+Focus on topics that appear in recent papers but aren't well covered."""
+
+_TRANSITION_INSTRUCTIONS = """You are an expert at creating smooth transitions.
+
+Create a 1-2 sentence transition between the two sections you are given.
+Make it natural and maintain flow."""
+
+# Per-axis instructions and response keys for the batched improvement prompt
+_BATCH_AXIS_INSTRUCTIONS = {
+    'coverage': (
+        'coverage_additions',
+        '"coverage_additions": 1-2 paragraphs (string) covering the most important topics missing from the survey'
+    ),
+    'coherence': (
+        'transitions',
+        '"transitions": list with one 1-2 sentence transition (string) from each section to the next, in order'
+    ),
+    'citations': (
+        'citation_fixes',
+        '"citation_fixes": list of {"index": section index, "content": full section content with [Author, Year] '
+        'citations added to unsupported claims}; keep structure and wording otherwise unchanged'
+    ),
+    'structure': (
+        'structure_changes',
+        '"structure_changes": {"changes_needed": true/false, "reorder": true if sections should be reordered}'
+    ),
+}
+
+
+def _normalize_sections(survey: Dict) -> List[SurveySection]:
+    """
+    Convert dict sections to SurveySection in place.
+    
+    Run once where a survey enters the iteration loop or the improver so the
+    improvement code can use plain attribute access.
+    """
+    sections = survey.get('sections', [])
+    for i, section in enumerate(sections):
+        if isinstance(section, dict):
+            sections[i] = SurveySection.from_dict(section, i + 1)
+    return sections
+
+
+def _improvement_inputs(improver: 'TargetedImprover', verification: 'VerificationResult') -> Tuple:
+    """
+    Every part of a verification that shapes an improvement pass.
+    
+    The improvement axes decide which passes run; the critical issues are
+    quoted in the batched prompt.
+    """
+    return (
+        tuple(improver._identify_improvements(verification)),
+        tuple(verification.critical_issues)
+    )
+
+
+def _extract_json(content: str):
+    """
+    Parse the outermost JSON object in an LLM response.
+    
+    Returns None when the response contains no braces; raises
+    json.JSONDecodeError (orjson's subclasses it) on malformed JSON.
+    """
+    stripped = content.strip()
+    # Bare JSON responses need no regex scan
+    if stripped.startswith('{') and stripped.endswith('}'):
+        return _json_loads(stripped)
+    json_match = _JSON_RE.search(content)
+    return _json_loads(json_match.group()) if json_match else None
+
+
+def _checkpoint_default(obj):
+    """Serialize dataclasses (SurveySection, VerificationResult) for checkpoints."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _checkpoint_dumps(obj) -> bytes:
+    """Encode a checkpoint object to JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_checkpoint_default)
+    return json.dumps(obj, default=_checkpoint_default).encode()
+
+
+def _write_gzip(path: Path, payload: bytes):
+    """
+    Compress and write a checkpoint payload (runs on the checkpoint I/O thread).
+    
+    Writes to a hidden temporary file first and renames it into place, so a
+    reader never sees a partially written checkpoint.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        logger.debug(f"Saved checkpoint to {path}")
+    except OSError as e:
+        logger.error(f"Error writing checkpoint {path}: {e}")
+
+
+# Checkpoint I/O thread shared by every IterativeSurveySystem, so building one
+# system per topic does not leave an idle writer thread behind for each
+_CHECKPOINT_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+
 
 @dataclass
 class VerificationResult:
@@ -50,6 +203,9 @@ class GlobalVerifier:
     Uses multi-criteria evaluation across the entire survey.
     """
     
+    # Upper bound on survey text sent for verification
+    MAX_SURVEY_CHARS = 6000
+    
     def __init__(self, claude_wrapper: Optional[EnhancedClaudeWrapper] = None):
         """
         Initialize with a Claude wrapper.
@@ -59,6 +215,10 @@ class GlobalVerifier:
                           If None, creates a new instance.
         """
         self.claude_wrapper = claude_wrapper or EnhancedClaudeWrapper()
+        # id(section) -> (title, content, rendered) from the previous verification
+        self._section_cache: Dict[int, Tuple[str, str, str]] = {}
+        # (papers list, formatted summary); the same list is passed every iteration
+        self._papers_summary_cache: Optional[Tuple[List[Dict], str]] = None
         
     def verify_survey(self, survey: Dict, papers: List[Dict]) -> VerificationResult:
         """
@@ -75,14 +235,15 @@ class GlobalVerifier:
         
         # Prepare survey text
         survey_text = self._format_survey_for_verification(survey)
-        papers_summary = self._format_papers_summary(papers[:20])  # Sample papers
+        if self._papers_summary_cache is not None and self._papers_summary_cache[0] is papers:
+            papers_summary = self._papers_summary_cache[1]
+        else:
+            papers_summary = self._format_papers_summary(papers[:20])  # Sample papers
+            self._papers_summary_cache = (papers, papers_summary)
         
         # Multi-criteria evaluation prompt
         messages = [
-            {
-                "role": "system",
-                "content": "You are an expert survey evaluator assessing academic survey quality."
-            },
+            {"role": "system", "content": _VERIFICATION_RUBRIC},
             {
                 "role": "user",
                 "content": f"""Evaluate this survey globally across multiple criteria.
@@ -93,32 +254,13 @@ Survey Content:
 {survey_text}
 
 Reference Papers (sample):
-{papers_summary}
-
-Evaluate on a 1-5 scale for each criterion:
-1. Coverage: Does the survey comprehensively cover the topic?
-2. Structure: Is the survey well-organized with logical flow?
-3. Coherence: Are sections connected with smooth transitions?
-4. Citations: Are claims properly supported with citations?
-5. Insights: Does the survey provide valuable synthesis and insights?
-
-Respond in JSON format:
-{{
-    "coverage_score": 0.0,
-    "structure_score": 0.0,
-    "coherence_score": 0.0,
-    "citation_score": 0.0,
-    "insights_score": 0.0,
-    "critical_issues": ["issue1", "issue2"],
-    "improvement_suggestions": ["suggestion1", "suggestion2"]
-}}"""
+{papers_summary}"""
             }
         ]
         
         response = self.claude_wrapper.chat_completion(
             messages=messages,
-            model="sonnet",  # Use balanced model for verification
-            use_cache=False
+            model="sonnet"  # Use balanced model for verification
         )
         
         if "error" in response:
@@ -129,11 +271,8 @@ Respond in JSON format:
         try:
             content = response["choices"][0]["message"]["content"]
             # Extract JSON from response
-            import re
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                scores_data = json.loads(json_match.group())
-            else:
+            scores_data = _extract_json(content)
+            if scores_data is None:
                 scores_data = {}
                 
             # Create verification result
@@ -164,21 +303,47 @@ Respond in JSON format:
             return self._default_verification_result()
             
     def _format_survey_for_verification(self, survey: Dict) -> str:
-        """Format survey for verification prompt."""
-        parts = []
+        """
+        Format survey for verification prompt, re-rendering only changed sections.
+        
+        Each section contributes its first 500 characters; output stops once
+        MAX_SURVEY_CHARS characters have been written. Sections may be dicts
+        or SurveySection objects and are read without being converted.
+        """
+        cache = {}
+        buf = io.StringIO()
+        remaining = self.MAX_SURVEY_CHARS
         for section in survey.get('sections', []):
-            if isinstance(section, SurveySection):
-                parts.append(f"\n## {section.title}\n{section.content[:500]}...")
-            elif isinstance(section, dict):
-                parts.append(f"\n## {section.get('title', 'Untitled')}\n{section.get('content', '')[:500]}...")
-        return "\n".join(parts)
+            if remaining <= 0:
+                break
+            if isinstance(section, dict):
+                title, content = section.get('title', ''), section.get('content', '')
+            else:
+                title, content = section.title, section.content
+            
+            # Improvements always produce a new content string, so an identity
+            # check is enough to detect an unchanged section
+            cached = self._section_cache.get(id(section))
+            if cached is not None and cached[0] == title and cached[1] is content:
+                rendered = cached[2]
+            else:
+                rendered = f"\n## {title}\n{content[:500]}..."
+            cache[id(section)] = (title, content, rendered)
+            
+            if buf.tell():
+                remaining -= buf.write("\n")
+            remaining -= buf.write(rendered[:remaining])
+            
+        # Keep only the sections seen in this survey
+        self._section_cache = cache
+        return buf.getvalue()
         
     def _format_papers_summary(self, papers: List[Dict]) -> str:
         """Format papers summary for context."""
-        summary = []
-        for i, paper in enumerate(papers, 1):
-            summary.append(f"{i}. {paper.get('title', 'Unknown')[:100]}")
-        return "\n".join(summary)
+        return "\n".join(
+            f"{i}. {paper.get('title', 'Unknown')[:100]}"
+            for i, paper in enumerate(papers, 1)
+        )
         
     def _default_verification_result(self) -> VerificationResult:
         """Return default verification result when verification fails."""
@@ -199,6 +364,9 @@ class TargetedImprover:
     Generate targeted improvements based on verification results.
     """
     
+    # Survey prefix length shown to the model when looking for coverage gaps
+    COVERAGE_CONTEXT_CHARS = 1000
+    
     def __init__(self, claude_wrapper: Optional[EnhancedClaudeWrapper] = None):
         """
         Initialize with a Claude wrapper.
@@ -231,9 +399,20 @@ class TargetedImprover:
         # Identify weakest areas
         improvements_needed = self._identify_improvements(verification)
         
+        # The improvement passes use SurveySection attributes only
+        _normalize_sections(survey)
+        
         # Apply improvements
         improved_survey = survey.copy()
         
+        # Several weak axes are fixed with one LLM call; the per-axis passes
+        # below remain the fallback
+        if len(improvements_needed) > 1:
+            try:
+                return self._batched_improve(improved_survey, verification, improvements_needed, papers)
+            except ValueError as e:
+                logger.warning(f"Batched improvement failed, falling back to per-axis passes: {e}")
+        
         for improvement_type in improvements_needed:
             if improvement_type == 'coverage':
                 improved_survey = self._improve_coverage(improved_survey, papers)
@@ -246,6 +425,121 @@ class TargetedImprover:
                 
         return improved_survey
         
+    def _batched_improve(
+        self,
+        survey: Dict,
+        verification: VerificationResult,
+        needs: List[str],
+        papers: List[Dict]
+    ) -> Dict:
+        """
+        Apply all needed improvements from a single multi-criteria LLM call.
+        
+        The response is fully parsed and validated before the survey is touched,
+        so a ValueError leaves the survey unchanged for the per-axis fallback.
+        
+        Args:
+            survey: Current survey
+            verification: Verification results
+            needs: Improvement types from _identify_improvements
+            papers: Available papers
+            
+        Returns:
+            Improved survey
+        """
+        logger.info(f"Applying batched improvements: {', '.join(needs)}")
+        
+        sections = survey.get('sections', [])
+        sections_text = "\n".join(
+            f"[{i}] ## {section.title}\n{section.content}"
+            for i, section in enumerate(sections)
+        )
+            
+        keys = [_BATCH_AXIS_INSTRUCTIONS[need] for need in needs]
+        schema = "\n".join(instruction for _, instruction in keys)
+        papers_text = ""
+        if 'citations' in needs:
+            papers_text = "\n\nAvailable papers for citation:\n" + "\n".join(
+                f"Title: {paper.get('title', '')}" for paper in papers[:30]
+            )[:2000]
+        issues = "\n".join(f"- {issue}" for issue in verification.critical_issues)
+        
+        messages = [
+            {
+                "role": "system",
+                "content": "You are an expert at revising academic surveys. Fix all requested issues at once and respond only with JSON."
+            },
+            {
+                "role": "user",
+                "content": f"""Improve this survey. Return a JSON object with exactly these keys:
+{schema}
+
+Reported issues:
+{issues or '- None'}
+
+Survey sections (index in brackets):
+{sections_text}{papers_text}"""
+            }
+        ]
+        
+        response = self.claude_wrapper.chat_completion(
+            messages=messages,
+            model="sonnet",
+            use_cache=True
+        )
+        
+        if isinstance(response, dict) and "choices" in response:
+            content = response["choices"][0]["message"]["content"]
+        elif isinstance(response, str):
+            content = response
+        else:
+            raise ValueError(f"Unexpected response: {response.get('error') if isinstance(response, dict) else type(response)}")
+            
+        try:
+            edits = _extract_json(content)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in response: {e}")
+        if edits is None:
+            raise ValueError("No JSON object in response")
+        if not isinstance(edits, dict):
+            raise ValueError("Response JSON is not an object")
+            
+        # Validate every requested edit before mutating anything
+        for key, _ in keys:
+            if key not in edits:
+                raise ValueError(f"Missing key: {key}")
+        additions = edits.get('coverage_additions', '')
+        transitions = edits.get('transitions', [])
+        citation_fixes = edits.get('citation_fixes', [])
+        structure_changes = edits.get('structure_changes', {})
+        if not isinstance(additions, str):
+            raise ValueError("coverage_additions must be a string")
+        if not isinstance(transitions, list) or not all(isinstance(t, str) for t in transitions):
+            raise ValueError("transitions must be a list of strings")
+        if not isinstance(citation_fixes, list) or not all(
+            isinstance(fix, dict)
+            and isinstance(fix.get('index'), int)
+            and 0 <= fix['index'] < len(sections)
+            and isinstance(fix.get('content'), str)
+            for fix in citation_fixes
+        ):
+            raise ValueError("citation_fixes must be a list of {index, content} objects")
+        if not isinstance(structure_changes, dict):
+            raise ValueError("structure_changes must be an object")
+            
+        # Citation fixes rewrite whole sections, so they go before the appends
+        for fix in citation_fixes:
+            sections[fix['index']].content = fix['content']
+        if additions and sections:
+            sections[-1].content += f"\n\n{additions}"
+        for section, transition in zip(sections[:-1], transitions):
+            section.content += f"\n\n{transition}"
+        if structure_changes.get('changes_needed'):
+            self._apply_structure_changes(sections, bool(structure_changes.get('reorder')))
+            survey['sections'] = sections
+            
+        return survey
+        
     def _identify_improvements(self, verification: VerificationResult) -> List[str]:
         """Identify which improvements to prioritize."""
         improvements = []
@@ -266,26 +560,23 @@ class TargetedImprover:
         """Improve content coverage."""
         logger.info("Improving coverage")
         
-        # Identify missing topics
-        survey_text = " ".join([
-            s.content if isinstance(s, SurveySection) else s.get('content', '')
-            for s in survey.get('sections', [])
-        ])
+        # Identify missing topics; only the first COVERAGE_CONTEXT_CHARS of the
+        # space-joined sections go into the prompt, so stop copying there
+        buf = io.StringIO()
+        for i, section in enumerate(survey.get('sections', [])):
+            if buf.tell() >= self.COVERAGE_CONTEXT_CHARS:
+                break
+            if i:
+                buf.write(" ")
+            buf.write(section.content[:self.COVERAGE_CONTEXT_CHARS - buf.tell()])
+        survey_text = buf.getvalue()[:self.COVERAGE_CONTEXT_CHARS]
         
         messages = [
-            {
-                "role": "system",
-                "content": "You are an expert at identifying gaps in survey coverage."
-            },
+            {"role": "system", "content": _COVERAGE_INSTRUCTIONS},
             {
                 "role": "user",
-                "content": f"""Identify 2-3 important topics missing from this survey:
-
-Current survey (summary):
-{survey_text[:1000]}...
-
-Add 1-2 paragraphs covering the most important missing topics.
-Focus on topics that appear in recent papers but aren't well covered."""
+                "content": f"""Current survey (summary):
+{survey_text}..."""
             }
         ]
         
@@ -299,16 +590,16 @@ Focus on topics that appear in recent papers but aren't well covered."""
             additional_content = response["choices"][0]["message"]["content"]
             # Add to conclusion or create new section
             if survey.get('sections'):
-                last_section = survey['sections'][-1]
-                if isinstance(last_section, SurveySection):
-                    last_section.content += f"\n\n{additional_content}"
-                elif isinstance(last_section, dict):
-                    last_section['content'] = last_section.get('content', '') + f"\n\n{additional_content}"
+                survey['sections'][-1].content += f"\n\n{additional_content}"
                     
         return survey
         
     def _improve_coherence(self, survey: Dict) -> Dict:
         """Improve section transitions and flow."""
+        return asyncio.run(self._improve_coherence_async(survey))
+        
+    async def _improve_coherence_async(self, survey: Dict) -> Dict:
+        """Generate all section transitions concurrently and append them in order."""
         logger.info("Improving coherence")
         
         sections = survey.get('sections', [])
@@ -316,40 +607,39 @@ Focus on topics that appear in recent papers but aren't well covered."""
             return survey
             
         # Add transition sentences between sections
-        for i in range(len(sections) - 1):
-            current = sections[i]
-            next_sec = sections[i + 1]
-            
-            current_title = current.title if isinstance(current, SurveySection) else current.get('title', '')
-            next_title = next_sec.title if isinstance(next_sec, SurveySection) else next_sec.get('title', '')
-            
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are an expert at creating smooth transitions."
-                },
-                {
-                    "role": "user",
-                    "content": f"""Create a 1-2 sentence transition from "{current_title}" to "{next_title}".
-Make it natural and maintain flow."""
-                }
-            ]
-            
-            response = self.claude_wrapper.chat_completion(
-                messages=messages,
-                model="haiku",
-                use_cache=True
-            )
-            
+        pairs = list(zip(sections[:-1], sections[1:]))
+        responses = await asyncio.gather(
+            *(self._generate_transition(current, next_sec) for current, next_sec in pairs),
+            return_exceptions=True
+        )
+        
+        for (current, _), response in zip(pairs, responses):
+            if isinstance(response, Exception):
+                logger.error(f"Error generating transition: {response}")
+                continue
             if "error" not in response:
                 transition = response["choices"][0]["message"]["content"]
-                if isinstance(current, SurveySection):
-                    current.content += f"\n\n{transition}"
-                elif isinstance(current, dict):
-                    current['content'] = current.get('content', '') + f"\n\n{transition}"
+                current.content += f"\n\n{transition}"
                     
         return survey
         
+    async def _generate_transition(self, current: SurveySection, next_sec: SurveySection) -> Dict:
+        """Request a transition between two adjacent sections."""
+        messages = [
+            {"role": "system", "content": _TRANSITION_INSTRUCTIONS},
+            {
+                "role": "user",
+                "content": f'From "{current.title}" to "{next_sec.title}".'
+            }
+        ]
+        
+        return await asyncio.to_thread(
+            self.claude_wrapper.chat_completion,
+            messages=messages,
+            model="haiku",
+            use_cache=True
+        )
+        
     def _improve_citations(self, survey: Dict, papers: List[Dict]) -> Dict:
         """Add missing citations to unsupported claims."""
         logger.info("Improving citations")
@@ -366,12 +656,8 @@ Make it natural and maintain flow."""
         # Process each section
         sections = survey.get('sections', [])
         for i, section in enumerate(sections):
-            if isinstance(section, SurveySection):
-                content = section.content
-                title = section.title
-            else:
-                content = section.get('content', '')
-                title = section.get('title', '')
+            content = section.content
+            title = section.title
             
             # Identify claims without citations
             messages = [
@@ -413,10 +699,7 @@ Return the improved section with proper citations added. Keep the same structure
                     continue
                 
                 # Update section with improved content
-                if isinstance(section, SurveySection):
-                    section.content = improved_content
-                else:
-                    section['content'] = improved_content
+                section.content = improved_content
                     
                 logger.info(f"Improved citations in section: {title}")
                 
@@ -435,14 +718,7 @@ Return the improved section with proper citations added. Keep the same structure
         section_summaries = []
         
         for section in sections:
-            if isinstance(section, SurveySection):
-                title = section.title
-                content = section.content[:300]
-            else:
-                title = section.get('title', '')
-                content = section.get('content', '')[:300]
-            
-            section_summaries.append(f"{title}: {content}...")
+            section_summaries.append(f"{section.title}: {section.content[:300]}...")
         
         current_structure = "\n".join(section_summaries)
         
@@ -489,38 +765,8 @@ Provide specific instructions for restructuring. If the structure is already goo
                 logger.info("Structure already optimal")
                 return survey
             
-            # Apply suggested reordering if mentioned
-            if "reorder" in suggestions.lower() or "move" in suggestions.lower():
-                # Parse suggestions to identify reordering
-                # For now, ensure Introduction is first and Conclusion is last
-                intro_idx = None
-                conclusion_idx = None
-                
-                for i, section in enumerate(sections):
-                    title = section.title if isinstance(section, SurveySection) else section.get('title', '')
-                    if 'introduction' in title.lower():
-                        intro_idx = i
-                    elif 'conclusion' in title.lower():
-                        conclusion_idx = i
-                
-                # Move introduction to start if not already there
-                if intro_idx is not None and intro_idx != 0:
-                    sections.insert(0, sections.pop(intro_idx))
-                    logger.info("Moved Introduction to beginning")
-                
-                # Move conclusion to end if not already there
-                if conclusion_idx is not None and conclusion_idx != len(sections) - 1:
-                    sections.append(sections.pop(conclusion_idx))
-                    logger.info("Moved Conclusion to end")
-            
-            # Add section numbering for clarity
-            for i, section in enumerate(sections):
-                if isinstance(section, SurveySection):
-                    if not section.title.startswith(f"{i+1}."):
-                        section.title = f"{i+1}. {section.title}"
-                else:
-                    if not section.get('title', '').startswith(f"{i+1}."):
-                        section['title'] = f"{i+1}. {section.get('title', '')}"
+            reorder = "reorder" in suggestions.lower() or "move" in suggestions.lower()
+            self._apply_structure_changes(sections, reorder)
             
             survey['sections'] = sections
             logger.info("Structure improved with reordering and numbering")
@@ -529,6 +775,37 @@ Provide specific instructions for restructuring. If the structure is already goo
             logger.error(f"Error improving structure: {e}")
         
         return survey
+        
+    def _apply_structure_changes(self, sections: List[SurveySection], reorder: bool):
+        """Reorder (if requested) and number sections in place."""
+        # Apply suggested reordering if mentioned
+        if reorder:
+            # Parse suggestions to identify reordering
+            # For now, ensure Introduction is first and Conclusion is last
+            intro_idx = None
+            conclusion_idx = None
+            
+            for i, section in enumerate(sections):
+                title = section.title
+                if 'introduction' in title.lower():
+                    intro_idx = i
+                elif 'conclusion' in title.lower():
+                    conclusion_idx = i
+            
+            # Move introduction to start if not already there
+            if intro_idx is not None and intro_idx != 0:
+                sections.insert(0, sections.pop(intro_idx))
+                logger.info("Moved Introduction to beginning")
+            
+            # Move conclusion to end if not already there
+            if conclusion_idx is not None and conclusion_idx != len(sections) - 1:
+                sections.append(sections.pop(conclusion_idx))
+                logger.info("Moved Conclusion to end")
+        
+        # Add section numbering for clarity
+        for i, section in enumerate(sections):
+            if not section.title.startswith(f"{i+1}."):
+                section.title = f"{i+1}. {section.title}"
 
 
 class IterativeSurveySystem:
@@ -537,13 +814,19 @@ class IterativeSurveySystem:
     Our novel contribution - uses global assessment and targeted improvement.
     """
     
+    # Overall-score drop that counts as a regression (the improvement is reverted)
+    REGRESSION_TOLERANCE = 0.05
+    # Minimum per-iteration gain; two smaller gains in a row end the loop
+    PLATEAU_DELTA = 0.1
+    
     def __init__(
         self,
         base_generator: Optional[AutoSurveyBaseline] = None,
         verifier: Optional[GlobalVerifier] = None,
         improver: Optional[TargetedImprover] = None,
         max_iterations: int = 5,
-        checkpoint_dir: str = "data/checkpoints"
+        checkpoint_dir: str = "data/checkpoints",
+        speculative_improvement: bool = False
     ):
         """
         Initialize iterative system.
@@ -554,13 +837,23 @@ class IterativeSurveySystem:
             improver: Targeted improver
             max_iterations: Maximum iterations before stopping
             checkpoint_dir: Directory for saving checkpoints
+            speculative_improvement: Run the next improvement pass on a copy of the
+                survey while it is being verified, reusing it when the verification
+                asks for the same improvements (trades extra API calls for latency)
         """
         self.base_generator = base_generator or AutoSurveyBaseline()
         self.verifier = verifier or GlobalVerifier()
         self.improver = improver or TargetedImprover()
         self.max_iterations = max_iterations
+        self.speculative_improvement = speculative_improvement
         self.checkpoint_dir = Path(checkpoint_dir)
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        # Checkpoints are compressed and written off the iteration loop on
+        # the shared _CHECKPOINT_POOL
+        self._pending_checkpoint: Optional[Future] = None
+        self._last_checkpoint_digest: Optional[str] = None
+        # Distinguishes runs sharing a checkpoint directory; renewed per generation
+        self._run_id = uuid.uuid4().hex[:8]
         
     def generate_survey_iteratively(
         self,
@@ -580,19 +873,36 @@ class IterativeSurveySystem:
             Final survey with iteration history
         """
         logger.info(f"Starting iterative survey generation for '{topic}'")
+        self._run_id = uuid.uuid4().hex[:8]
+        self._last_checkpoint_digest = None
         
         # Generate initial survey
         logger.info("Iteration 0: Generating base survey")
         current_survey = self.base_generator.generate_survey(
             papers, topic, target_sections
         )
+        _normalize_sections(current_survey)
         
         iteration_history = []
         converged = False
+        previous_verification = None
+        previous_survey_snapshot = None
+        
+        # Speculative improvement passes run on this executor (see __init__)
+        executor = ThreadPoolExecutor(max_workers=1) if self.speculative_improvement else None
         
         for iteration in range(1, self.max_iterations + 1):
             logger.info(f"\nIteration {iteration}/{self.max_iterations}")
             
+            # Speculatively improve a copy using the previous verification while
+            # the current draft is verified
+            speculative = None
+            if executor is not None and previous_verification is not None:
+                speculative = executor.submit(
+                    self.improver.improve_survey,
+                    copy.deepcopy(current_survey), previous_verification, papers
+                )
+            
             # Global verification
             verification = self.verifier.verify_survey(current_survey, papers)
             logger.info(f"Verification score: {verification.overall_score:.2f}")
@@ -616,10 +926,47 @@ class IterativeSurveySystem:
                 converged = True
                 break
                 
-            # Apply targeted improvements
-            current_survey = self.improver.improve_survey(
-                current_survey, verification, papers
-            )
+            # Stop early when the last improvement made things worse (keeping the
+            # survey from before it) or when scores have stopped moving
+            if len(iteration_history) >= 2:
+                scores = [entry['overall_score'] for entry in iteration_history[-3:]]
+                if scores[-1] <= scores[-2] - self.REGRESSION_TOLERANCE:
+                    logger.info(f"Score regressed at iteration {iteration}; reverting to previous survey")
+                    current_survey = previous_survey_snapshot
+                    break
+                if len(scores) == 3 and all(
+                    later - earlier < self.PLATEAU_DELTA
+                    for earlier, later in zip(scores, scores[1:])
+                ):
+                    logger.info(f"Scores plateaued at iteration {iteration}; stopping")
+                    break
+                    
+            previous_survey_snapshot = copy.deepcopy(current_survey)
+            
+            # Apply targeted improvements, reusing the speculative pass only when
+            # its verification would have produced the same improvement prompt
+            if speculative is not None and (
+                _improvement_inputs(self.improver, previous_verification)
+                == _improvement_inputs(self.improver, verification)
+            ):
+                logger.info("Reusing speculative improvement")
+                current_survey = speculative.result()
+            else:
+                if speculative is not None:
+                    speculative.cancel()
+                current_survey = self.improver.improve_survey(
+                    current_survey, verification, papers
+                )
+            previous_verification = verification
+            
+        if executor is not None:
+            # Drop queued speculative passes and wait for a running one, so no
+            # LLM calls are still in flight once this method returns
+            executor.shutdown(wait=True, cancel_futures=True)
+            
+        # Make sure the last checkpoint is on disk before returning
+        if self._pending_checkpoint is not None:
+            self._pending_checkpoint.result()
             
         # Final survey with metadata
         final_survey = current_survey
@@ -635,19 +982,38 @@ class IterativeSurveySystem:
         survey: Dict,
         iteration: int,
         verification: VerificationResult
-    ):
-        """Save iteration checkpoint."""
-        checkpoint_file = self.checkpoint_dir / f"iter_{iteration}_{time.time()}.pkl"
-        checkpoint_data = {
-            'survey': survey,
+    ) -> Optional[Future]:
+        """
+        Save iteration checkpoint as gzipped JSON.
+        
+        The survey is serialized immediately (it is mutated in place by later
+        iterations); compression and the file write happen on a background
+        thread. Checkpoints whose survey is unchanged since the previous one
+        are skipped.
+        
+        Returns:
+            Future for the pending write, or None if the checkpoint was skipped
+        """
+        survey_bytes = _checkpoint_dumps(survey)
+        digest = hashlib.sha256(survey_bytes).hexdigest()
+        if digest == self._last_checkpoint_digest:
+            logger.debug(f"Survey unchanged, skipping checkpoint for iteration {iteration}")
+            return None
+        self._last_checkpoint_digest = digest
+        
+        # Zero-padded so checkpoints of a run sort by iteration
+        checkpoint_file = self.checkpoint_dir / f"iter_{iteration:04d}_{self._run_id}.json.gz"
+        # Splice the already serialized survey into the payload instead of
+        # encoding it a second time
+        rest = _checkpoint_dumps({
             'iteration': iteration,
             'verification': verification,
             'timestamp': time.time()
-        }
+        })
+        payload = b''.join((b'{"survey":', survey_bytes, b',', rest[1:]))
         
-        with open(checkpoint_file, 'wb') as f:
-            pickle.dump(checkpoint_data, f)
-        logger.debug(f"Saved checkpoint to {checkpoint_file}")
+        self._pending_checkpoint = _CHECKPOINT_POOL.submit(_write_gzip, checkpoint_file, payload)
+        return self._pending_checkpoint
 
 
 def test_iterative_system():
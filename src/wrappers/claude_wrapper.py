@@ -10,6 +10,7 @@ import time
 import hashlib
 import pickle
 import logging
+import threading
 from pathlib import Path
 from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, timedelta
@@ -31,22 +32,25 @@ class RateLimiter:
         self.max_delay = max_delay
         self.last_call_time = 0
         self.consecutive_errors = 0
+        # Serializes call starts when requests are issued from several threads
+        self._lock = threading.Lock()
         
     def wait_if_needed(self):
         """Wait if necessary to respect rate limits."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_call_time
-        
-        # Calculate delay with exponential backoff for errors
-        delay = self.min_delay * (2 ** self.consecutive_errors)
-        delay = min(delay, self.max_delay)
-        
-        if time_since_last < delay:
-            wait_time = delay - time_since_last
-            logger.debug(f"Rate limiting: waiting {wait_time:.2f} seconds")
-            time.sleep(wait_time)
+        with self._lock:
+            current_time = time.time()
+            time_since_last = current_time - self.last_call_time
             
-        self.last_call_time = time.time()
+            # Calculate delay with exponential backoff for errors
+            delay = self.min_delay * (2 ** self.consecutive_errors)
+            delay = min(delay, self.max_delay)
+            
+            if time_since_last < delay:
+                wait_time = delay - time_since_last
+                logger.debug(f"Rate limiting: waiting {wait_time:.2f} seconds")
+                time.sleep(wait_time)
+                
+            self.last_call_time = time.time()
         
     def register_success(self):
         """Reset error counter on successful call."""
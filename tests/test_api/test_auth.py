@@ -0,0 +1,78 @@
+"""
+Tests for API key middleware
+"""
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.api.middleware.auth import create_api_key_middleware, WebSocketAPIKeyMiddleware
+
+
+@pytest.fixture
+def client():
+    """Create a client for a minimal app guarded by the middleware."""
+    app = FastAPI()
+    app.middleware("http")(create_api_key_middleware("secret"))
+    app.add_middleware(WebSocketAPIKeyMiddleware, api_key="secret")
+
+    @app.get("/api/v1/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/api/v1/surveys/x")
+    async def survey():
+        return {"survey_id": "x"}
+
+    @app.websocket("/ws/{survey_id}")
+    async def updates(websocket: WebSocket, survey_id: str):
+        await websocket.accept()
+        await websocket.send_json({"survey_id": survey_id})
+        await websocket.close()
+
+    return TestClient(app)
+
+
+def test_public_path_needs_no_key(client):
+    """Health checks bypass authentication."""
+    assert client.get("/api/v1/health").status_code == 200
+
+
+def test_missing_or_wrong_key_rejected(client):
+    """Protected paths reject absent or wrong keys."""
+    assert client.get("/api/v1/surveys/x").status_code == 401
+    response = client.get("/api/v1/surveys/x", headers={"X-API-Key": "wrong"})
+    assert response.status_code == 401
+
+
+def test_valid_key_accepted(client):
+    """The configured key grants access."""
+    response = client.get("/api/v1/surveys/x", headers={"X-API-Key": "secret"})
+    assert response.status_code == 200
+    assert response.json() == {"survey_id": "x"}
+
+
+def test_websocket_without_key_rejected(client):
+    """WebSocket handshakes without the right key are closed before accept."""
+    for url, headers in (("/ws/x", {}), ("/ws/x?api_key=wrong", {}),
+                         ("/ws/x", {"X-API-Key": "wrong"})):
+        with pytest.raises(WebSocketDisconnect) as excinfo:
+            with client.websocket_connect(url, headers=headers):
+                pass
+        assert excinfo.value.code == 1008
+
+
+def test_websocket_with_key_accepted(client):
+    """The key is accepted from the header or the api_key query parameter."""
+    for url, headers in (("/ws/x", {"X-API-Key": "secret"}), ("/ws/x?api_key=secret", {})):
+        with client.websocket_connect(url, headers=headers) as ws:
+            assert ws.receive_json() == {"survey_id": "x"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
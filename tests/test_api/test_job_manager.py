@@ -0,0 +1,329 @@
+"""
+Tests for the survey job manager
+"""
+
+import asyncio
+import json
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.api.job_manager import JobManager, JobStatus, JobPhase, _calc_progress
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Create a job manager with an isolated history file."""
+    monkeypatch.chdir(tmp_path)
+    return JobManager(max_concurrent_jobs=2)
+
+
+class TestJobQueue:
+    """Test queue bookkeeping."""
+
+    def test_cancelled_pending_job_is_skipped(self, manager, monkeypatch):
+        """Cancelled pending jobs stay queued but are never started."""
+        started = []
+
+        async def fake_process(job_id):
+            started.append(job_id)
+            manager.active_jobs.discard(job_id)
+
+        monkeypatch.setattr(manager, "_process_job", fake_process)
+
+        for job_id in ("a", "b", "c"):
+            manager.create_job(job_id, "topic", "baseline")
+        assert manager.cancel_job("b")
+        assert manager.get_queue_status()["pending"] == 2
+
+        async def run():
+            await manager.process_queue()
+            await manager.stop_workers()
+
+        asyncio.run(run())
+
+        assert started == ["a", "c"]
+        assert manager.get_queue_status()["pending"] == 0
+        assert manager.jobs["b"].status == JobStatus.CANCELLED.value
+
+    def test_unknown_update_goes_to_metadata(self, manager):
+        """Updates that are not job fields are kept in metadata."""
+        manager.create_job("a", "topic", "baseline", max_iterations=3)
+        manager.update_job("a", quality_score=3.5, reviewer="x")
+
+        job = manager.get_job("a")
+        assert job.quality_score == 3.5
+        assert job.metadata == {"max_iterations": 3, "reviewer": "x"}
+        assert job.max_iterations == 3
+
+    def test_cancel_active_job(self, manager):
+        """Cancelling an active job frees its slot."""
+        manager.create_job("a", "topic", "baseline")
+        manager.job_queue.popleft()
+        manager.active_jobs.add("a")
+        manager.update_job("a", status=JobStatus.PROCESSING.value)
+
+        assert manager.cancel_job("a")
+        assert manager.get_queue_status()["active"] == 0
+        assert not manager._cancelled
+
+    def test_workers_bound_concurrency(self, manager, monkeypatch):
+        """No more than max_concurrent_jobs run at once."""
+        peak = []
+
+        async def fake_process(job_id):
+            peak.append(len(manager.active_jobs))
+            await asyncio.sleep(0.01)
+            manager.active_jobs.discard(job_id)
+
+        monkeypatch.setattr(manager, "_process_job", fake_process)
+
+        for i in range(5):
+            manager.create_job(f"job-{i}", "topic", "baseline")
+
+        async def run():
+            await asyncio.wait_for(manager.process_queue(), timeout=1)
+            await manager.stop_workers()
+
+        asyncio.run(run())
+
+        assert len(peak) == 5
+        assert max(peak) == manager.max_concurrent_jobs
+
+    def test_queue_survives_separate_loops(self, manager):
+        """One manager can drain its queue from successive event loops."""
+        async def run():
+            await asyncio.wait_for(manager.process_queue(), timeout=1)
+            await manager.stop_workers()
+
+        manager.create_job("a", "topic", "baseline")
+        asyncio.run(run())
+        manager.create_job("b", "topic", "baseline")
+        asyncio.run(run())
+
+        assert manager.get_job("b").status == JobStatus.COMPLETED.value
+        assert manager.get_queue_status()["pending"] == 0
+
+
+
+class TestProcessJob:
+    """Test phase progression of a job."""
+
+    def test_job_runs_to_completion_without_event(self, manager):
+        """Jobs without a phase event complete without fixed delays."""
+        manager.create_job("a", "topic", "baseline")
+
+        async def run():
+            await asyncio.wait_for(manager.process_queue(), timeout=1)
+            await manager.stop_workers()
+
+        asyncio.run(run())
+
+        job = manager.get_job("a")
+        assert job.status == JobStatus.COMPLETED.value
+        assert job.phase == "finalizing"
+
+    def test_phases_advance_on_event(self, manager):
+        """Each set of the phase event advances the job one phase."""
+        manager.create_job("a", "topic", "baseline")
+
+        async def run():
+            phase_done = manager.phase_event("a")
+            manager.job_queue.popleft()
+            task = asyncio.create_task(manager._process_job("a"))
+            await asyncio.sleep(0)
+            seen = [manager.get_job("a").phase]
+            for _ in range(5):
+                phase_done.set()
+                await asyncio.sleep(0)
+                seen.append(manager.get_job("a").phase)
+            assert not task.done()
+            phase_done.set()
+            await asyncio.wait_for(task, timeout=1)
+            return seen
+
+        seen = asyncio.run(run())
+        assert seen == [
+            "loading_papers", "generating_outline", "writing_sections",
+            "verifying_quality", "improving_content", "finalizing"
+        ]
+        assert manager.get_job("a").status == JobStatus.COMPLETED.value
+        assert "a" not in manager._phase_events
+
+
+class TestBatchUpdate:
+    """Test coalesced job updates."""
+
+    def test_batch_applies_changes_in_order(self, manager, monkeypatch):
+        """A batch applies every change but records history once."""
+        recorded = []
+        monkeypatch.setattr(manager, "_record_history", recorded.append)
+        manager.create_job("a", "topic", "baseline")
+
+        assert manager.update_job_batch("a", [
+            {"status": JobStatus.PROCESSING.value},
+            {"phase": "finalizing"},
+            {"status": JobStatus.COMPLETED.value, "quality_score": 4.0}
+        ])
+
+        job = manager.get_job("a")
+        assert job.status == JobStatus.COMPLETED.value
+        assert job.progress == 95
+        assert job.started_at is not None
+        assert job.quality_score == 4.0
+        assert recorded == [job]
+        assert manager.get_queue_status()["completed"] == 1
+
+    def test_batch_unknown_job(self, manager):
+        """Batches for unknown jobs are rejected."""
+        assert not manager.update_job_batch("missing", [{"phase": "finalizing"}])
+
+
+class TestQueueStatus:
+    """Test status counts reported by get_queue_status."""
+
+    def test_counts_follow_transitions(self, manager):
+        """Counts move with each status change and cleanup."""
+        for job_id in ("a", "b", "c"):
+            manager.create_job(job_id, "topic", "baseline")
+        manager.update_job("a", status=JobStatus.PROCESSING.value)
+        manager.update_job("a", status=JobStatus.COMPLETED.value)
+        manager.update_job("b", status=JobStatus.FAILED.value)
+        manager.cancel_job("c")
+
+        status = manager.get_queue_status()
+        assert status["completed"] == 1
+        assert status["failed"] == 1
+        assert manager._status_counts[JobStatus.PENDING.value] == 0
+
+        manager.jobs["a"].completed_at = "2000-01-01T00:00:00"
+        manager.cleanup_old_jobs(days=1)
+        assert manager.get_queue_status()["completed"] == 0
+
+
+class TestHistory:
+    """Test job history persistence."""
+
+    def test_finished_jobs_appended_and_reloaded(self, manager):
+        """Finished jobs are appended one per line and reloaded."""
+        manager.create_job("a", "topic", "baseline")
+        manager.create_job("b", "topic", "baseline")
+        manager.update_job("a", status=JobStatus.COMPLETED.value, quality_score=4.0)
+        manager.update_job("b", status=JobStatus.FAILED.value, error="boom")
+
+        lines = manager.job_history_file.read_text().splitlines()
+        assert len(lines) == 2
+
+        reloaded = JobManager()
+        assert set(reloaded.jobs) == {"a", "b"}
+        assert reloaded.jobs["a"].quality_score == 4.0
+        assert reloaded.jobs["b"].error == "boom"
+        assert reloaded.get_queue_status()["failed"] == 1
+
+    def test_legacy_history_imported_once(self, tmp_path, monkeypatch):
+        """A legacy JSON history is converted to JSON Lines on first load."""
+        monkeypatch.chdir(tmp_path)
+        legacy = tmp_path / "data" / "job_history.json"
+        legacy.parent.mkdir()
+        legacy.write_text(json.dumps({
+            "a": {"job_id": "a", "status": "completed", "quality_score": 4.0},
+            "b": {"job_id": "b", "status": "processing"}
+        }))
+
+        manager = JobManager()
+        assert set(manager.jobs) == {"a"}
+        assert manager.job_history_file.read_text().count("\n") == 1
+
+        legacy.write_text("{}")
+        reloaded = JobManager()
+        assert reloaded.jobs["a"].quality_score == 4.0
+
+    def test_compaction_after_threshold(self, manager):
+        """The file is rewritten once too many lines were appended."""
+        manager.HISTORY_COMPACT_THRESHOLD = 2
+        for job_id in ("a", "b", "c"):
+            manager.create_job(job_id, "topic", "baseline")
+            manager.update_job(job_id, status=JobStatus.COMPLETED.value)
+
+        assert manager._dirty_count == 0
+        lines = manager.job_history_file.read_text().splitlines()
+        assert len(lines) == 3
+
+    def test_save_requests_coalesce_in_loop(self, manager, monkeypatch):
+        """A burst of save requests inside a loop produces one rewrite."""
+        writes = []
+        monkeypatch.setattr(manager, "save_history", lambda: writes.append(1))
+
+        async def run():
+            for _ in range(10):
+                manager._request_save()
+            await asyncio.sleep(0.05)
+            await manager.flush_history()
+
+        asyncio.run(run())
+        assert writes == [1]
+
+    def test_flush_writes_pending_request(self, manager, monkeypatch):
+        """flush_history performs a requested rewrite that has not run yet."""
+        writes = []
+        monkeypatch.setattr(manager, "save_history", lambda: writes.append(1))
+
+        async def run():
+            manager._request_save()
+            await manager.flush_history()
+
+        asyncio.run(run())
+        assert writes == [1]
+
+
+class TestProgress:
+    """Test progress and time estimation."""
+
+    def test_progress_table_matches_formula(self):
+        """Table lookups equal phase weight plus truncated iteration share."""
+        weights = {"writing_sections": 40, "finalizing": 95}
+        for phase, base in weights.items():
+            for max_iterations in range(1, 12):
+                for current in range(2 * max_iterations + 1):
+                    expected = int(min(base + (current / max_iterations) * 20, 95))
+                    assert _calc_progress(phase, current, max_iterations) == expected
+        assert _calc_progress(JobPhase.INITIALIZING.value, 0, 0) == 5
+        assert _calc_progress("unknown", 1, 2) == 10
+        # Iterations beyond max_iterations still add progress, up to 95
+        assert _calc_progress("unknown", 3, 2) == 30
+        assert _calc_progress(JobPhase.INITIALIZING.value, 3, 2) == 35
+        assert _calc_progress("unknown", 20, 2) == 95
+
+    def test_time_remaining_uses_start_timestamp(self, manager):
+        """Remaining time is extrapolated from the float start time."""
+        manager.create_job("a", "topic", "baseline")
+        manager.update_job("a", status=JobStatus.PROCESSING.value)
+        job = manager.jobs["a"]
+        assert job.started_at is not None
+
+        job.started_ts -= 10
+        job.progress = 50
+        remaining = manager._estimate_time_remaining(job, job.started_ts + 10)
+        assert remaining == 10
+
+    def test_estimate_skipped_when_progress_unchanged(self, manager, monkeypatch):
+        """Updates that leave progress alone keep the previous estimate."""
+        manager.create_job("a", "topic", "baseline")
+        manager.update_job("a", status=JobStatus.PROCESSING.value)
+        manager.update_job("a", phase="writing_sections")
+        calls = []
+        monkeypatch.setattr(
+            manager, "_estimate_time_remaining",
+            lambda job, now=None: calls.append(job.job_id) or 0
+        )
+
+        manager.update_job("a", quality_score=3.0)
+        assert calls == []
+        manager.update_job("a", phase="verifying_quality")
+        assert calls == ["a"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
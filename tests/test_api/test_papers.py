@@ -0,0 +1,89 @@
+"""
+Tests for paper upload endpoints
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.api.main import app
+from src.api.endpoints import papers
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Create test client writing uploads under a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(papers, "papers_db", {})
+    monkeypatch.setattr(papers, "session_papers", {})
+    return TestClient(app)
+
+
+def test_upload_saves_pdf(client, tmp_path):
+    """Uploaded PDFs are written to the session directory."""
+    data = b"%PDF-1.4 test" * 1000
+    response = client.post(
+        "/api/v1/papers/upload",
+        files=[("files", ("paper.pdf", data, "application/pdf"))]
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["papers_uploaded"] == 1
+
+    saved = tmp_path / body["papers"][0]["file_path"]
+    assert saved.read_bytes() == data
+
+
+def test_upload_strips_path_traversal(client, tmp_path):
+    """Client-supplied directory components never escape the upload directory."""
+    response = client.post(
+        "/api/v1/papers/upload",
+        files=[("files", ("../../escaped.pdf", b"%PDF", "application/pdf"))]
+    )
+    assert response.status_code == 200
+    paper = response.json()["papers"][0]
+    assert paper["filename"] == "escaped.pdf"
+
+    saved = (tmp_path / paper["file_path"]).resolve()
+    assert saved.parent == (tmp_path / "uploads" / response.json()["session_id"]).resolve()
+    assert not (tmp_path.parent / "escaped.pdf").exists()
+    assert not (tmp_path.parent.parent / "escaped.pdf").exists()
+
+
+def test_upload_rejects_empty_filename(client):
+    """A filename with nothing but directory components is rejected."""
+    response = client.post(
+        "/api/v1/papers/upload",
+        files=[("files", ("../.pdf", b"%PDF", "application/pdf"))]
+    )
+    assert response.status_code == 400
+
+
+def test_list_papers_by_session(client):
+    """Listing pages through one session in upload order."""
+    sessions = []
+    for batch in (["a", "b", "c"], ["d"]):
+        response = client.post(
+            "/api/v1/papers/upload",
+            files=[("files", (f"{name}.pdf", b"%PDF", "application/pdf")) for name in batch]
+        )
+        sessions.append(response.json()["session_id"])
+
+    response = client.get(
+        "/api/v1/papers/",
+        params={"session_id": sessions[0], "page": 2, "page_size": 2}
+    )
+    body = response.json()
+    assert body["total_count"] == 3
+    assert [p["title"] for p in body["papers"]] == ["c"]
+
+    body = client.get("/api/v1/papers/", params={"page_size": 3}).json()
+    assert body["total_count"] == 4
+    assert [p["title"] for p in body["papers"]] == ["a", "b", "c"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,115 @@
+"""
+Tests for WebSocket update delivery
+"""
+
+import asyncio
+import json
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.endpoints.websocket import ConnectionManager, manager as ws_manager
+
+
+class TestConnectionManager:
+    """Test update publishing and waiting."""
+
+    def test_waiter_wakes_on_broadcast(self):
+        """A waiting handler receives the next published update."""
+        manager = ConnectionManager()
+
+        async def run():
+            waiter = asyncio.create_task(manager.wait_for_update("s1", 0))
+            await asyncio.sleep(0)
+            assert not waiter.done()
+            await manager.broadcast("s1", {"progress": 10})
+            return await asyncio.wait_for(waiter, timeout=1)
+
+        version, payload = asyncio.run(run())
+        assert version == 1
+        assert json.loads(payload) == {"progress": 10}
+
+    def test_waiter_gets_latest_after_burst(self):
+        """Updates published between waits collapse to the newest one."""
+        manager = ConnectionManager()
+
+        async def run():
+            await manager.broadcast("s1", {"progress": 10})
+            await manager.broadcast("s1", {"progress": 20})
+            return await asyncio.wait_for(manager.wait_for_update("s1", 0), timeout=1)
+
+        version, payload = asyncio.run(run())
+        assert version == 2
+        assert json.loads(payload) == {"progress": 20}
+
+    def test_duplicate_update_not_republished(self):
+        """Re-broadcasting the current state does not bump the version."""
+        manager = ConnectionManager()
+
+        async def run():
+            first = await manager.broadcast("s1", {"progress": 10})
+            second = await manager.broadcast("s1", {"progress": 10})
+            return first, second
+
+        assert asyncio.run(run()) == (True, False)
+        assert manager.update_versions["s1"] == 1
+
+    def test_final_update_releases_state(self):
+        """A finished survey's state is dropped once no client is connected."""
+        manager = ConnectionManager()
+        socket = object()
+        manager.active_connections["s1"].add(socket)
+
+        async def run():
+            await manager.broadcast("s1", {"status": "completed"}, final=True)
+            assert manager.update_versions["s1"] == 1
+            manager.disconnect(socket, "s1")
+            await manager.broadcast("s2", {"status": "completed"}, final=True)
+
+        asyncio.run(run())
+        for store in (manager.latest_updates, manager.update_versions,
+                      manager.update_conditions, manager.finished_surveys):
+            assert not store
+
+    def test_unpublished_survey_released_on_disconnect(self):
+        """Connecting to a survey that never published leaves no state behind."""
+        manager = ConnectionManager()
+        socket = object()
+
+        async def run():
+            manager.active_connections["unknown"].add(socket)
+            waiter = asyncio.create_task(manager.wait_for_update("unknown", 0))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            manager.disconnect(socket, "unknown")
+
+            manager.active_connections["running"].add(socket)
+            await manager.broadcast("running", {"progress": 10})
+            manager.disconnect(socket, "running")
+
+        asyncio.run(run())
+        assert "unknown" not in manager.update_conditions
+        assert manager.update_versions == {"running": 1}
+
+
+class TestWebSocketEndpoint:
+    """Test the WebSocket route."""
+
+    def test_connection_cleaned_up_on_disconnect(self):
+        """Closing the socket removes it from the active connections."""
+        with TestClient(app) as client:
+            with client.websocket_connect("/ws/survey-1") as ws:
+                message = ws.receive_json()
+                assert message["type"] == "connection"
+                assert len(ws_manager.active_connections["survey-1"]) == 1
+
+        assert "survey-1" not in ws_manager.active_connections
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
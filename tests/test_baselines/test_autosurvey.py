@@ -476,5 +476,24 @@ class TestAutoSurveyIntegration:
             assert mock_instance.query.call_count == 5
 
 
+class TestChunkedOutline:
+    """Tests for parallel chunk outline generation"""
+    
+    def test_chunk_outlines_keep_order(self):
+        """Chunk outlines are generated concurrently but merged in chunk order"""
+        wrapper = Mock()
+        autosurvey = AutoSurveyBaseline(claude_wrapper=wrapper, chunk_size=2, max_workers=3)
+        papers = [{"title": f"Paper {i}"} for i in range(6)]
+        
+        with patch.object(autosurvey, '_generate_chunk_outline',
+                          side_effect=lambda chunk, topic, n: [chunk[0]["title"]]) as mock_chunk:
+            with patch.object(autosurvey, '_merge_outlines',
+                              side_effect=lambda outlines, n: outlines) as mock_merge:
+                outline = autosurvey._generate_chunked_outline(papers, "Topic", 3)
+        
+        assert mock_chunk.call_count == 3
+        assert outline == [["Paper 0"], ["Paper 2"], ["Paper 4"]]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,283 @@
+"""
+Tests for AutoSurvey with Local Coherence Enhancement
+"""
+
+import pytest
+import threading
+import time
+from unittest.mock import Mock
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.baselines.autosurvey_lce import (
+    AutoSurveyLCE, _LCE_INSTRUCTIONS, _extract_title, _section_from_response
+)
+
+
+def make_survey(n):
+    """Build a survey with n sections"""
+    return "\n\n".join(f"## Section {i}\n\nBody of section {i}." for i in range(n))
+
+
+@pytest.fixture
+def lce():
+    """Create an LCE instance with a mock wrapper that enhances any section"""
+    return AutoSurveyLCE(Mock(), min_section_chars=0)
+
+
+class TestApplyLCE:
+    """Tests for the two LCE passes"""
+    
+    def test_passes_enhance_expected_sections(self, lce, monkeypatch):
+        """Pass 1 covers sections 2, 4, ...; pass 2 covers 1, 3, ..."""
+        calls = []
+        
+        def fake_enhance(prev, current, nxt=None, titles=None):
+            calls.append(current.split("\n")[0])
+            return current + " [enhanced]"
+        
+        monkeypatch.setattr(lce, "_enhance_transition", fake_enhance)
+        result = lce._apply_lce(make_survey(5))
+        
+        assert sorted(calls[:2]) == ["## Section 2", "## Section 4"]
+        assert sorted(calls[2:]) == ["## Section 1", "## Section 3"]
+        sections = lce._parse_sections(result)
+        assert sections[0] == "## Section 0\n\nBody of section 0."
+        assert all(s.endswith("[enhanced]") for s in sections[1:])
+    
+    def test_titles_passed_from_parse(self, lce, monkeypatch):
+        """Each call receives the parsed titles of its neighbours"""
+        seen = {}
+        
+        def fake_enhance(prev, current, nxt=None, titles=None):
+            seen[titles[1]] = titles
+            return current
+        
+        monkeypatch.setattr(lce, "_enhance_transition", fake_enhance)
+        lce._apply_lce(make_survey(3))
+        
+        assert seen == {
+            "Section 2": ("Section 1", "Section 2", None),
+            "Section 1": ("Section 0", "Section 1", "Section 2"),
+        }
+    
+    def test_previous_section_passed_as_tail(self, lce, monkeypatch):
+        """Calls receive only the ending of the previous section"""
+        prevs = []
+        
+        def fake_enhance(prev, current, nxt=None, titles=None):
+            prevs.append(prev)
+            return current
+        
+        monkeypatch.setattr(lce, "_enhance_transition", fake_enhance)
+        survey = "## A\n\n" + "x" * 1000 + "\n\n## B\n\nShort body."
+        lce._apply_lce(survey)
+        
+        assert prevs == ["x" * 200]
+    
+    def test_single_pass_uses_original_neighbours(self, monkeypatch):
+        """single_pass enhances every section but the first in one wave"""
+        lce = AutoSurveyLCE(Mock(), single_pass=True, min_section_chars=0)
+        prevs = {}
+        
+        def fake_enhance(prev, current, nxt=None, titles=None):
+            prevs[titles[1]] = prev
+            return current + " [enhanced]"
+        
+        monkeypatch.setattr(lce, "_enhance_transition", fake_enhance)
+        result = lce._apply_lce(make_survey(4))
+        
+        assert sorted(prevs) == ["Section 1", "Section 2", "Section 3"]
+        assert all("[enhanced]" not in prev for prev in prevs.values())
+        assert result.count("[enhanced]") == 3
+    
+    def test_pass_runs_concurrently_within_limit(self, lce, monkeypatch):
+        """Sections in one pass are enhanced in parallel up to max_concurrency"""
+        lce.max_concurrency = 2
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+        
+        def fake_enhance(prev, current, nxt=None, titles=None):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            return current
+        
+        monkeypatch.setattr(lce, "_enhance_transition", fake_enhance)
+        lce._apply_lce(make_survey(9))
+        
+        assert peak[0] == 2
+    
+    def test_short_sections_skipped(self, monkeypatch):
+        """Sections below min_section_chars are not sent for enhancement"""
+        lce = AutoSurveyLCE(Mock(), min_section_chars=100)
+        enhanced = []
+        
+        def fake_enhance(prev, current, nxt=None, titles=None):
+            enhanced.append(titles[1])
+            return current
+        
+        monkeypatch.setattr(lce, "_enhance_transition", fake_enhance)
+        survey = "## A\n\nShort.\n\n## B\n\n" + "y" * 200 + "\n\n## C\n\nShort too."
+        lce._apply_lce(survey)
+        
+        assert enhanced == ["B"]
+    
+    def test_heuristic_mode_makes_no_calls(self):
+        """Heuristic mode adds transition phrases locally"""
+        lce = AutoSurveyLCE(Mock(), mode="heuristic")
+        result = lce._apply_lce(make_survey(3))
+        
+        lce.wrapper.chat_completion.assert_not_called()
+        sections = lce._parse_sections(result)
+        assert "Building on the previous discussion" not in sections[0]
+        assert all("Building on the previous discussion" in s for s in sections[1:])
+    
+    def test_existing_transition_not_duplicated(self, lce):
+        """Sections that already open with a transition are left alone"""
+        section = "## B\n\nMoreover, the method scales."
+        assert lce._add_transition_phrases(section, prev_context="## A") == section
+        
+        plain = "## B\n\nThe method scales."
+        assert lce._add_transition_phrases(plain, prev_context="## A").split("\n")[2] == \
+            "Building on the previous discussion, "
+    
+    def test_unknown_mode_rejected(self):
+        """Only the llm and heuristic modes exist"""
+        with pytest.raises(ValueError):
+            AutoSurveyLCE(Mock(), mode="other")
+    
+    def test_single_section_unchanged(self, lce):
+        """Surveys with one section are returned as-is"""
+        survey = make_survey(1)
+        assert lce._apply_lce(survey) == survey
+        lce.wrapper.chat_completion.assert_not_called()
+    
+    def test_survey_without_headers_skips_parsing(self, lce, monkeypatch):
+        """Surveys without section headers are returned before any split"""
+        parse = Mock()
+        monkeypatch.setattr(lce, "_parse_sections", parse)
+        survey = "Plain draft with a # heading and text ## inline."
+        
+        assert lce._apply_lce(survey) == survey
+        parse.assert_not_called()
+
+    
+    def test_windows_pack_sections_into_one_call(self):
+        """sections_per_call groups sections after the first into one call each"""
+        lce = AutoSurveyLCE(Mock(), min_section_chars=0, sections_per_call=3)
+        
+        def reply(messages, model):
+            body = messages[1]["content"].split("Sections:\n", 1)[1]
+            parts = body.strip().split("\n---SEP---\n")
+            return "\n---SEP---\n".join(p + " [enhanced]" for p in parts)
+        
+        lce.wrapper.chat_completion.side_effect = reply
+        result = lce._apply_lce(make_survey(6))
+        
+        assert lce.wrapper.chat_completion.call_count == 2
+        sections = lce._parse_sections(result)
+        assert len(sections) == 6
+        assert "[enhanced]" not in sections[0]
+        assert all(s.endswith("[enhanced]") for s in sections[1:])
+    
+    def test_window_falls_back_per_section(self, monkeypatch):
+        """Replies that do not split into the window's sections are redone one by one"""
+        lce = AutoSurveyLCE(Mock(), min_section_chars=0, sections_per_call=2)
+        lce.wrapper.chat_completion.return_value = "## Only one section back"
+        calls = []
+        
+        def fake_enhance(prev, current, nxt=None, titles=None):
+            calls.append((current.split("\n")[0], nxt.split("\n")[0] if nxt else None, titles))
+            return current
+        
+        monkeypatch.setattr(lce, "_enhance_transition", fake_enhance)
+        result = lce._apply_lce(make_survey(3))
+        
+        assert calls == [
+            ("## Section 1", "## Section 2", ("Section 0", "Section 1", "Section 2")),
+            ("## Section 2", None, ("Section 1", "Section 2", None))
+        ]
+        assert result == make_survey(3)
+
+
+class TestEnhanceTransition:
+    """Tests for a single enhancement call"""
+    
+    def test_extract_title(self):
+        """Titles come from a leading header; other text maps to a default"""
+        assert _extract_title("## Methods \n\nBody") == "Methods"
+        assert _extract_title("## Header only") == "Header only"
+        assert _extract_title("Preamble without header") == "Section"
+    
+    def test_static_instructions_in_system_message(self, lce):
+        """Every call shares the same system prefix; only the user turn varies"""
+        lce.wrapper.chat_completion.return_value = "## B\n\nBetter body."
+        lce._enhance_transition("## A\n\nFirst.", "## B\n\nBody.", "## C\n\nLast.")
+        lce._enhance_transition("## B\n\nBody.", "## C\n\nLast.")
+        
+        first, second = [c.args[0] for c in lce.wrapper.chat_completion.call_args_list]
+        assert first[0] == second[0] == {"role": "system", "content": _LCE_INSTRUCTIONS}
+        assert "Current section: B" in first[1]["content"]
+        assert "Next section: C" in first[1]["content"]
+        assert "Next section: Conclusion" in second[1]["content"]
+        assert "Task:" not in first[1]["content"]
+    
+    def test_context_filled_from_template(self, lce):
+        """Braces in section text are kept verbatim and defaults fill missing neighbours"""
+        lce.wrapper.chat_completion.return_value = "## B\n\nBody."
+        lce._enhance_transition(None, "## B\n\nUses {x} and {{y}}.")
+        
+        context = lce.wrapper.chat_completion.call_args.args[0][1]["content"]
+        assert context == (
+            "Previous section: Introduction\n"
+            "Current section: B\n"
+            "Next section: Conclusion\n\n"
+            "Current section content:\n## B\n\nUses {x} and {{y}}.\n\n"
+            "Previous section ending (last 200 chars):\nN/A\n"
+        )
+    
+    def test_json_response_rebuilt(self, lce):
+        """JSON replies from the wrapper are turned back into a section"""
+        lce.wrapper.chat_completion.return_value = {
+            "choices": [{"message": {
+                "content": '{"header": "## B", "body": "Building on A, body."}'
+            }}]
+        }
+        result = lce._enhance_transition("## A\n\nFirst.", "## B\n\nBody.")
+        assert result == "## B\n\nBuilding on A, body."
+    
+    def test_error_response_keeps_original(self, lce):
+        """Wrapper error dicts leave the section unchanged"""
+        lce.wrapper.chat_completion.return_value = {"error": {"message": "x"}}
+        assert lce._enhance_transition("## A", "## B\n\nBody.") == "## B\n\nBody."
+    
+    def test_section_from_response_fallbacks(self):
+        """Missing headers are reattached rather than discarding the rewrite"""
+        current = "## Methods\n\nOld body."
+        assert _section_from_response("New body.", current) == "## Methods\n\nNew body."
+        assert _section_from_response("## Methods\n\nNew.", current) == "## Methods\n\nNew."
+        assert _section_from_response('{"body": "New."}', current) == "## Methods\n\nNew."
+        assert _section_from_response("  ", current) == current
+    
+    def test_section_from_response_json_replies(self):
+        """Fenced JSON is unwrapped; unusable JSON keeps the original section"""
+        current = "## Methods\n\nOld body."
+        fenced = '```json\n{"header": "Methods", "body": "New."}\n```'
+        assert _section_from_response(fenced, current) == "## Methods\n\nNew."
+        trailing = '{"body": "New."}\nHope this helps!'
+        assert _section_from_response(trailing, current) == "## Methods\n\nNew."
+        for unusable in ('{"header": "M", "body": 1}', '{"body": "New."',
+                         '```json\n{"header": "M"}\n```', '{"body": "  "}'):
+            assert _section_from_response(unusable, current) == current
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
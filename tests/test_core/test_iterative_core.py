@@ -4,11 +4,13 @@ Core tests for iterative.py to improve coverage
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+import copy
 import json
 import tempfile
+import time
 from pathlib import Path
 import sys
-import pickle
+import gzip
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
@@ -17,7 +19,8 @@ from src.our_system.iterative import (
     GlobalVerifier,
     TargetedImprover,
     IterativeSurveySystem,
-    SurveySection
+    SurveySection,
+    _extract_json
 )
 from src.wrappers.claude_wrapper import EnhancedClaudeWrapper
 
@@ -127,7 +130,53 @@ class TestGlobalVerifier:
         assert 'Section 1' in formatted
         assert 'Content 1' in formatted
         assert 'Section 2' in formatted
-    
+
+    def test_format_survey_rerenders_changed_sections(self):
+        """Test cached section renderings are refreshed when content changes."""
+        verifier = GlobalVerifier(claude_wrapper=Mock(spec=EnhancedClaudeWrapper))
+
+        survey = {
+            'sections': [
+                {'title': 'Section 1', 'content': 'Content 1'},
+                {'title': 'Section 2', 'content': 'Content 2'}
+            ]
+        }
+
+        first = verifier._format_survey_for_verification(survey)
+        survey['sections'][1]['content'] += ' extended'
+        second = verifier._format_survey_for_verification(survey)
+
+        assert all(isinstance(section, dict) for section in survey['sections'])
+        assert 'Content 2 extended' not in first
+        assert 'Content 2 extended' in second
+        assert second.startswith(first.split('\n\n## Section 2')[0])
+        assert len(verifier._section_cache) == 2
+
+    def test_format_survey_respects_char_budget(self):
+        """Test formatted survey text is capped at MAX_SURVEY_CHARS."""
+        verifier = GlobalVerifier(claude_wrapper=Mock(spec=EnhancedClaudeWrapper))
+
+        survey = {
+            'sections': [
+                {'title': f'Section {i}', 'content': 'x' * 1000}
+                for i in range(20)
+            ]
+        }
+
+        formatted = verifier._format_survey_for_verification(survey)
+
+        assert len(formatted) <= GlobalVerifier.MAX_SURVEY_CHARS
+        assert formatted.startswith('\n## Section 0\n' + 'x' * 500 + '...')
+        assert 'Section 19' not in formatted
+
+    def test_extract_json(self):
+        """Test JSON extraction from bare and wrapped responses."""
+        assert _extract_json(' {"a": 1} ') == {"a": 1}
+        assert _extract_json('Scores:\n{"a": {"b": 2}}\nDone.') == {"a": {"b": 2}}
+        assert _extract_json('no json here') is None
+        with pytest.raises(json.JSONDecodeError):
+            _extract_json('{not json}')
+
     def test_format_papers_summary(self):
         """Test papers summary formatting."""
         verifier = GlobalVerifier()
@@ -228,6 +277,108 @@ class TestTargetedImprover:
                     mock_coherence.assert_called_once()
                     mock_citations.assert_called_once()
 
+    def test_batched_improvement_single_call(self):
+        """Test several weak axes are fixed with one LLM call."""
+        mock_wrapper = Mock(spec=EnhancedClaudeWrapper)
+        mock_wrapper.chat_completion.return_value = {"choices": [{"message": {"content": json.dumps({
+            "coverage_additions": "New topic",
+            "transitions": ["Bridge"],
+            "citation_fixes": [{"index": 0, "content": "Intro [Smith, 2024]"}]
+        })}}]}
+        improver = TargetedImprover(claude_wrapper=mock_wrapper)
+
+        survey = {
+            'sections': [
+                {'title': 'Intro', 'content': 'Intro'},
+                {'title': 'Methods', 'content': 'Methods'}
+            ]
+        }
+        verification = VerificationResult(
+            overall_score=3.0,
+            coverage_score=3.0,
+            structure_score=4.0,
+            coherence_score=3.0,
+            citation_score=3.0,
+            insights_score=3.0
+        )
+
+        improved = improver.improve_survey(survey, verification, [{'title': 'Paper 1'}])
+
+        assert mock_wrapper.chat_completion.call_count == 1
+        assert improved['sections'][0].content == 'Intro [Smith, 2024]\n\nBridge'
+        assert improved['sections'][1].content == 'Methods\n\nNew topic'
+
+    def test_batched_improvement_falls_back(self):
+        """Test per-axis passes run when the batched response is unusable."""
+        mock_wrapper = Mock(spec=EnhancedClaudeWrapper)
+        mock_wrapper.chat_completion.return_value = {"choices": [{"message": {"content": "not json"}}]}
+        improver = TargetedImprover(claude_wrapper=mock_wrapper)
+
+        survey = {'sections': [{'title': 'Intro', 'content': 'Intro'}]}
+        verification = VerificationResult(
+            overall_score=3.0,
+            coverage_score=3.0,
+            structure_score=4.0,
+            coherence_score=4.0,
+            citation_score=3.0,
+            insights_score=3.0
+        )
+
+        with patch.object(improver, '_improve_coverage', return_value=survey) as mock_coverage:
+            with patch.object(improver, '_improve_citations', return_value=survey) as mock_citations:
+                improver.improve_survey(survey, verification, [])
+
+        assert survey['sections'][0].content == 'Intro'
+        mock_coverage.assert_called_once()
+        mock_citations.assert_called_once()
+
+    def test_improve_coherence_concurrent(self):
+        """Test transitions are requested per pair and appended in order."""
+        mock_wrapper = Mock(spec=EnhancedClaudeWrapper)
+        def chat(messages, **kwargs):
+            prompt = messages[1]['content']
+            return {"choices": [{"message": {"content": prompt.split('"')[1] + " transition"}}]}
+        mock_wrapper.chat_completion.side_effect = chat
+        improver = TargetedImprover(claude_wrapper=mock_wrapper)
+
+        survey = {
+            'sections': [
+                SurveySection(title='A', content='Content A', section_number=1),
+                SurveySection(title='B', content='Content B', section_number=2),
+                SurveySection(title='C', content='Content C', section_number=3)
+            ]
+        }
+
+        improved = improver._improve_coherence(survey)
+
+        assert mock_wrapper.chat_completion.call_count == 2
+        assert improved['sections'][0].content == 'Content A\n\nA transition'
+        assert improved['sections'][1].content == 'Content B\n\nB transition'
+        assert improved['sections'][2].content == 'Content C'
+
+    def test_improve_coherence_skips_failed_pair(self):
+        """Test one failing transition call does not drop the others."""
+        mock_wrapper = Mock(spec=EnhancedClaudeWrapper)
+        def chat(messages, **kwargs):
+            if '"A"' in messages[1]['content']:
+                raise RuntimeError("boom")
+            return {"choices": [{"message": {"content": "ok"}}]}
+        mock_wrapper.chat_completion.side_effect = chat
+        improver = TargetedImprover(claude_wrapper=mock_wrapper)
+
+        survey = {
+            'sections': [
+                SurveySection(title='A', content='Content A', section_number=1),
+                SurveySection(title='B', content='Content B', section_number=2),
+                SurveySection(title='C', content='Content C', section_number=3)
+            ]
+        }
+
+        improved = improver._improve_coherence(survey)
+
+        assert improved['sections'][0].content == 'Content A'
+        assert improved['sections'][1].content == 'Content B\n\nok'
+
 
 class TestIterativeSurveySystem:
     """Test IterativeSurveySystem class."""
@@ -315,7 +466,152 @@ class TestIterativeSurveySystem:
             assert survey['total_iterations'] == 2
             assert len(survey['iteration_history']) == 2
             assert survey['method'] == 'global_iterative'
-    
+
+    def test_speculative_improvement_reused(self, mock_components):
+        """Test speculative improvement is adopted when the needed axes match."""
+        base_gen, verifier, improver = mock_components
+        verifier.verify_survey.side_effect = [
+            VerificationResult(
+                overall_score=score,
+                coverage_score=3.0,
+                structure_score=4.0,
+                coherence_score=4.0,
+                citation_score=4.0,
+                insights_score=4.0,
+                critical_issues=["Needs improvement"]
+            )
+            for score in (3.0, 3.2, 3.4)
+        ]
+        improver._identify_improvements.return_value = ['coverage']
+        improver.improve_survey.side_effect = lambda survey, verification, papers: {
+            'sections': survey['sections'] + [{'title': 'More', 'content': 'More'}]
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            system = IterativeSurveySystem(
+                base_generator=base_gen,
+                verifier=verifier,
+                improver=improver,
+                max_iterations=3,
+                checkpoint_dir=tmpdir,
+                speculative_improvement=True
+            )
+            survey = system.generate_survey_iteratively(
+                papers=[{'title': 'Paper 1'}],
+                topic="Test Topic",
+                target_sections=2
+            )
+
+        # One improvement per iteration; iterations 2-3 come from speculation
+        assert improver.improve_survey.call_count == 3
+        assert len(survey['sections']) == 5
+        assert survey['total_iterations'] == 3
+
+    def test_speculative_improvement_discarded_on_new_issues(self, mock_components):
+        """Test a speculative pass is not reused when the critical issues changed."""
+        base_gen, verifier, improver = mock_components
+        verifier.verify_survey.side_effect = [
+            VerificationResult(
+                overall_score=score,
+                coverage_score=3.0,
+                structure_score=4.0,
+                coherence_score=4.0,
+                citation_score=4.0,
+                insights_score=4.0,
+                critical_issues=[f"Issue {score}"]
+            )
+            for score in (3.0, 3.2)
+        ]
+        improver._identify_improvements.return_value = ['coverage']
+        finished = []
+
+        def improve(survey, verification, papers):
+            time.sleep(0.01)
+            finished.append(verification.critical_issues[0])
+            return {'sections': survey['sections'] + [{'title': 'More', 'content': 'More'}]}
+
+        improver.improve_survey.side_effect = improve
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            system = IterativeSurveySystem(
+                base_generator=base_gen,
+                verifier=verifier,
+                improver=improver,
+                max_iterations=2,
+                checkpoint_dir=tmpdir,
+                speculative_improvement=True
+            )
+            survey = system.generate_survey_iteratively(
+                papers=[{'title': 'Paper 1'}],
+                topic="Test Topic",
+                target_sections=2
+            )
+            # Every pass has finished by the time the method returns
+            assert sorted(finished) == ["Issue 3.0", "Issue 3.0", "Issue 3.2"]
+
+        # Iteration 2 used a fresh pass against its own verification
+        assert len(survey['sections']) == 4
+
+    def _scored(self, score):
+        return VerificationResult(
+            overall_score=score,
+            coverage_score=3.0,
+            structure_score=3.0,
+            coherence_score=3.0,
+            citation_score=3.0,
+            insights_score=3.0,
+            critical_issues=["Needs improvement"]
+        )
+
+    def test_score_regression_reverts(self, mock_components):
+        """Test a score drop stops the loop and keeps the pre-improvement survey."""
+        base_gen, verifier, improver = mock_components
+        verifier.verify_survey.side_effect = [self._scored(3.5), self._scored(3.2)]
+        improver.improve_survey.return_value = {
+            'sections': [{'title': 'Worse', 'content': 'Worse'}]
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            system = IterativeSurveySystem(
+                base_generator=base_gen,
+                verifier=verifier,
+                improver=improver,
+                max_iterations=5,
+                checkpoint_dir=tmpdir
+            )
+            survey = system.generate_survey_iteratively(
+                papers=[{'title': 'Paper 1'}],
+                topic="Test Topic"
+            )
+
+        assert survey['total_iterations'] == 2
+        assert improver.improve_survey.call_count == 1
+        assert survey['sections'][0].title == 'Introduction'
+
+    def test_score_plateau_stops(self, mock_components):
+        """Test two small gains in a row end the loop."""
+        base_gen, verifier, improver = mock_components
+        verifier.verify_survey.side_effect = [
+            self._scored(score) for score in (3.0, 3.05, 3.1, 3.5, 3.9)
+        ]
+        improver.improve_survey.side_effect = lambda survey, verification, papers: survey
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            system = IterativeSurveySystem(
+                base_generator=base_gen,
+                verifier=verifier,
+                improver=improver,
+                max_iterations=5,
+                checkpoint_dir=tmpdir
+            )
+            survey = system.generate_survey_iteratively(
+                papers=[{'title': 'Paper 1'}],
+                topic="Test Topic"
+            )
+
+        assert survey['total_iterations'] == 3
+        assert improver.improve_survey.call_count == 2
+
     def test_checkpoint_saving(self):
         """Test checkpoint saving functionality."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -331,17 +627,25 @@ class TestIterativeSurveySystem:
                 insights_score=3.8
             )
             
-            system._save_checkpoint(survey, 1, verification)
+            system._save_checkpoint(survey, 1, verification).result()
             
-            checkpoint_files = list(Path(tmpdir).glob("iter_*.pkl"))
+            checkpoint_files = list(Path(tmpdir).glob("iter_*.json.gz"))
             assert len(checkpoint_files) == 1
+            assert checkpoint_files[0].name.startswith("iter_0001_")
+            assert not list(Path(tmpdir).glob(".*.tmp"))
             
             # Load and verify checkpoint
-            with open(checkpoint_files[0], 'rb') as f:
-                checkpoint = pickle.load(f)
+            with gzip.open(checkpoint_files[0], 'rb') as f:
+                checkpoint = json.load(f)
                 assert checkpoint['iteration'] == 1
                 assert checkpoint['survey'] == survey
-                assert checkpoint['verification'] == verification
+                assert VerificationResult(**checkpoint['verification']) == verification
+            
+            # An unchanged survey is not written again
+            assert system._save_checkpoint(survey, 2, verification) is None
+            survey['sections'][0]['content'] = 'Changed'
+            system._save_checkpoint(survey, 3, verification).result()
+            assert len(list(Path(tmpdir).glob("iter_*.json.gz"))) == 2
     
     def test_max_iterations_limit(self, mock_components):
         """Test that system respects max iterations."""
@@ -379,6 +683,34 @@ class TestIterativeSurveySystem:
             
             assert survey['converged'] == False
             assert survey['total_iterations'] == 2
+    
+    def test_survey_copied_at_most_once_per_iteration(self, mock_components):
+        """Test the loop snapshots the survey no more than once per iteration."""
+        base_gen, verifier, improver = mock_components
+        verifier.verify_survey.side_effect = [
+            self._scored(score) for score in (3.0, 3.3, 3.6, 3.9)
+        ]
+        improver.improve_survey.side_effect = lambda survey, verification, papers: {
+            'sections': [{'title': 'Improved', 'content': 'Improved'}]
+        }
+        deepcopy = Mock(wraps=copy.deepcopy)
+        
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch('src.our_system.iterative.copy', Mock(deepcopy=deepcopy)):
+            system = IterativeSurveySystem(
+                base_generator=base_gen,
+                verifier=verifier,
+                improver=improver,
+                max_iterations=4,
+                checkpoint_dir=tmpdir
+            )
+            survey = system.generate_survey_iteratively(
+                papers=[{'title': 'Paper 1'}],
+                topic="Test Topic"
+            )
+        
+        assert survey['total_iterations'] == 4
+        assert deepcopy.call_count <= survey['total_iterations']
 
 
 class TestImproverMethods:
@@ -1,67 +1,150 @@
 """
 Comprehensive tests for evaluation metrics
+
+Running this file directly skips the integration tests and, when
+pytest-xdist is installed, spreads the test classes over worker processes.
+Run them with: pytest tests/test_evaluation/test_metrics.py -m integration
 """
 
+import importlib.util
+from math import isclose
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import numpy as np
-import os
-import sys
-
-# Add src to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from types import SimpleNamespace
 
 from src.evaluation.metrics import (
     CitationMetrics,
     ContentMetrics,
     PerformanceMetrics,
-    SurveyEvaluator
+    SurveyEvaluator,
+    SurveyIndex,
+    CitationEvaluator,
+    ContentEvaluator,
+    SurveyComparator,
+    TRANSITION_PHRASES,
+    INSIGHT_KEYWORDS,
+    AHOCORASICK_AVAILABLE,
+    HYPERSCAN_AVAILABLE
+)
+
+
+# Long section bodies, repeated once at import rather than in each test
+_INTRO_BLOB = "This comprehensive introduction provides detailed background on the topic. " * 50
+_RELATED_WORK_BLOB = "We review extensive prior work in multiple areas. " * 100
+_DETAILED_BLOB = "Much longer and detailed content " * 20
+_PIPELINE_INTRO_BLOB = "This is a comprehensive introduction to the topic. " * 20
+_PIPELINE_METHODS_BLOB = "We describe our methodology in detail. " * 30
+
+# Read-only sample data, built once at import and shared by the fixtures below
+_SAMPLE_SURVEY = {
+    "sections": [
+        {
+            "title": "Introduction",
+            "content": "Recent work [1] shows that LLMs [2] are effective.",
+            "citations": ["Paper1", "Paper2"]
+        },
+        {
+            "title": "Methods",
+            "content": "We use technique from [3] and improve on [4].",
+            "citations": ["Paper3", "Paper4"]
+        }
+    ]
+}
+
+_SAMPLE_PAPERS = (
+    {"title": "Paper1", "abstract": "About LLMs"},
+    {"title": "Paper2", "abstract": "Language models"},
+    {"title": "Paper3", "abstract": "Methodology"},
+    {"title": "Paper4", "abstract": "Improvements"},
+    {"title": "Paper5", "abstract": "Uncited paper"}
 )
 
+_HIGH_QUALITY_SURVEY = {
+    "sections": [
+        {
+            "title": "Introduction",
+            "content": _INTRO_BLOB,
+            "subsections": ["Background", "Motivation", "Contributions"]
+        },
+        {
+            "title": "Related Work",
+            "content": _RELATED_WORK_BLOB,
+            "subsections": ["Area 1", "Area 2", "Area 3"]
+        }
+    ]
+}
+
+_LOW_QUALITY_SURVEY = {
+    "sections": [
+        {
+            "title": "Intro",
+            "content": "Short intro."
+        },
+        {
+            "title": "Work",
+            "content": "Some work."
+        }
+    ]
+}
+
+
+class _StubWrapper:
+    """Wrapper stand-in whose query always returns fixed scores"""
+    
+    def __init__(self, scores):
+        self._scores = scores
+    
+    def query(self, *args, **kwargs):
+        return self._scores
+
+
+def _subset(d, keys):
+    """Project a stats dict onto the keys a test checks"""
+    return {k: d[k] for k in keys}
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Replace the metrics module's clock with one advanced by hand
+    
+    Returns a one-element list holding the current time; tests bump
+    clock[0] instead of sleeping. Only the module's own reference to time
+    is swapped, so the real time module is untouched.
+    """
+    clock = [1000.0]
+    now = lambda: clock[0]
+    monkeypatch.setattr(
+        'src.evaluation.metrics.time',
+        SimpleNamespace(time=now, monotonic=now, perf_counter=now)
+    )
+    return clock
+
 
 class TestCitationMetrics:
     """Test suite for citation metrics"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def citation_metrics(self):
         """Create CitationMetrics instance"""
         return CitationMetrics()
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_survey(self):
         """Sample survey with citations"""
-        return {
-            "sections": [
-                {
-                    "title": "Introduction",
-                    "content": "Recent work [1] shows that LLMs [2] are effective.",
-                    "citations": ["Paper1", "Paper2"]
-                },
-                {
-                    "title": "Methods",
-                    "content": "We use technique from [3] and improve on [4].",
-                    "citations": ["Paper3", "Paper4"]
-                }
-            ]
-        }
+        return _SAMPLE_SURVEY
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_papers(self):
         """Sample papers for testing"""
-        return [
-            {"title": "Paper1", "abstract": "About LLMs"},
-            {"title": "Paper2", "abstract": "Language models"},
-            {"title": "Paper3", "abstract": "Methodology"},
-            {"title": "Paper4", "abstract": "Improvements"},
-            {"title": "Paper5", "abstract": "Uncited paper"}
-        ]
+        return _SAMPLE_PAPERS
     
     def test_citation_recall(self, citation_metrics, sample_survey, sample_papers):
         """Test citation recall calculation"""
         recall = citation_metrics.calculate_recall(sample_survey, sample_papers)
         
         # 4 out of 5 papers cited
-        assert recall == pytest.approx(0.8, rel=1e-3)
+        assert isclose(recall, 0.8, rel_tol=1e-3)
     
     def test_citation_precision(self, citation_metrics, sample_survey, sample_papers):
         """Test citation precision calculation"""
@@ -76,7 +159,7 @@ class TestCitationMetrics:
         
         # F1 = 2 * (0.8 * 1.0) / (0.8 + 1.0)
         expected_f1 = 2 * 0.8 / 1.8
-        assert f1 == pytest.approx(expected_f1, rel=1e-3)
+        assert isclose(f1, expected_f1, rel_tol=1e-3)
     
     def test_empty_citations(self, citation_metrics):
         """Test metrics with no citations"""
@@ -97,58 +180,35 @@ class TestCitationMetrics:
         assert distribution["sections_with_citations"] == 2
         assert distribution["avg_citations_per_section"] == 2.0
     
-    @pytest.mark.parametrize("survey,papers,expected_recall", [
-        ({"sections": []}, [{"title": "P1"}], 0.0),
-        ({"sections": [{"citations": ["P1"]}]}, [{"title": "P1"}], 1.0),
-        ({"sections": [{"citations": ["P1", "P2"]}]}, [{"title": "P1"}, {"title": "P2"}, {"title": "P3"}], 0.667),
-    ])
-    def test_recall_parametrized(self, citation_metrics, survey, papers, expected_recall):
+    def test_recall_cases(self, citation_metrics):
         """Test recall with various inputs"""
-        recall = citation_metrics.calculate_recall(survey, papers)
-        assert recall == pytest.approx(expected_recall, rel=1e-2)
+        cases = [
+            ({"sections": []}, [{"title": "P1"}], 0.0),
+            ({"sections": [{"citations": ["P1"]}]}, [{"title": "P1"}], 1.0),
+            ({"sections": [{"citations": ["P1", "P2"]}]}, [{"title": "P1"}, {"title": "P2"}, {"title": "P3"}], 0.667),
+        ]
+        got = np.array([citation_metrics.calculate_recall(s, p) for s, p, _ in cases])
+        expected = np.array([r for *_, r in cases])
+        np.testing.assert_allclose(got, expected, rtol=1e-2)
 
 
 class TestContentMetrics:
     """Test suite for content quality metrics"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def quality_metrics(self):
         """Create ContentMetrics instance"""
         return ContentMetrics()
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def high_quality_survey(self):
         """High quality survey sample"""
-        return {
-            "sections": [
-                {
-                    "title": "Introduction",
-                    "content": "This comprehensive introduction provides detailed background on the topic. " * 50,
-                    "subsections": ["Background", "Motivation", "Contributions"]
-                },
-                {
-                    "title": "Related Work",
-                    "content": "We review extensive prior work in multiple areas. " * 100,
-                    "subsections": ["Area 1", "Area 2", "Area 3"]
-                }
-            ]
-        }
+        return _HIGH_QUALITY_SURVEY
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def low_quality_survey(self):
         """Low quality survey sample"""
-        return {
-            "sections": [
-                {
-                    "title": "Intro",
-                    "content": "Short intro."
-                },
-                {
-                    "title": "Work",
-                    "content": "Some work."
-                }
-            ]
-        }
+        return _LOW_QUALITY_SURVEY
     
     def test_coverage_score(self, quality_metrics, high_quality_survey):
         """Test coverage scoring"""
@@ -210,18 +270,18 @@ class TestPerformanceMetrics:
         """Create PerformanceMetrics instance"""
         return PerformanceMetrics()
     
-    def test_iteration_tracking(self, performance_metrics):
+    def test_iteration_tracking(self, performance_metrics, fake_clock):
         """Test iteration tracking"""
         performance_metrics.start_iteration(1)
-        import time
-        time.sleep(0.1)
+        fake_clock[0] += 0.1
         performance_metrics.end_iteration(1, quality_score=3.5)
         
         stats = performance_metrics.get_iteration_stats(1)
         
         assert stats["iteration"] == 1
         assert stats["quality_score"] == 3.5
-        assert stats["duration"] >= 0.1
+        # Exact under the fake clock; no wall-clock jitter to allow for
+        assert isclose(stats["duration"], 0.1, abs_tol=1e-9)
     
     def test_convergence_detection(self, performance_metrics):
         """Test convergence detection"""
@@ -243,7 +303,7 @@ class TestPerformanceMetrics:
         rate = performance_metrics.calculate_improvement_rate()
         
         # (3.5 - 3.0) / 3.0 = 0.167
-        assert rate == pytest.approx(0.167, rel=1e-2)
+        assert isclose(rate, 0.167, rel_tol=1e-2)
     
     def test_api_call_tracking(self, performance_metrics):
         """Test API call tracking"""
@@ -253,11 +313,13 @@ class TestPerformanceMetrics:
         
         stats = performance_metrics.get_api_stats()
         
-        assert stats["total_calls"] == 3
-        assert stats["total_tokens"] == 450
-        assert stats["total_cost"] == pytest.approx(0.0065, rel=1e-4)
-        assert stats["by_model"]["haiku"]["calls"] == 2
-        assert stats["by_model"]["sonnet"]["calls"] == 1
+        assert _subset(stats, ["total_calls", "total_tokens"]) == {
+            "total_calls": 3, "total_tokens": 450
+        }
+        assert isclose(stats["total_cost"], 0.0065, rel_tol=1e-4)
+        assert {model: s["calls"] for model, s in stats["by_model"].items()} == {
+            "haiku": 2, "sonnet": 1
+        }
     
     def test_cache_statistics(self, performance_metrics):
         """Test cache hit/miss tracking"""
@@ -267,31 +329,28 @@ class TestPerformanceMetrics:
         
         stats = performance_metrics.get_cache_stats()
         
-        assert stats["hits"] == 2
-        assert stats["misses"] == 1
-        assert stats["hit_rate"] == pytest.approx(0.667, rel=1e-2)
+        assert _subset(stats, ["hits", "misses"]) == {"hits": 2, "misses": 1}
+        assert isclose(stats["hit_rate"], 0.667, rel_tol=1e-2)
 
 
 class TestSurveyEvaluator:
     """Test suite for comprehensive evaluator"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def evaluator(self):
         """Create SurveyEvaluator instance"""
         return SurveyEvaluator()
     
     @pytest.fixture
     def mock_wrapper(self):
-        """Mock Claude wrapper"""
-        wrapper = Mock()
-        wrapper.query.return_value = {
+        """Stub Claude wrapper"""
+        return _StubWrapper({
             "coverage": 4.0,
             "coherence": 4.2,
             "structure": 3.8,
             "citations": 4.1,
             "insights": 3.9
-        }
-        return wrapper
+        })
     
     def test_full_evaluation(self, evaluator, mock_wrapper):
         """Test full survey evaluation"""
@@ -304,12 +363,12 @@ class TestSurveyEvaluator:
         assert "scores" in results
         assert "overall" in results
         assert "feedback" in results
-        assert results["overall"] == pytest.approx(4.0, rel=1e-1)
+        assert isclose(results["overall"], 4.0, rel_tol=1e-1)
     
     def test_comparison_evaluation(self, evaluator):
         """Test comparison between surveys"""
         survey1 = {"sections": [{"content": "Short"}]}
-        survey2 = {"sections": [{"content": "Much longer and detailed content " * 20}]}
+        survey2 = {"sections": [{"content": _DETAILED_BLOB}]}
         
         comparison = evaluator.compare_surveys(survey1, survey2)
         
@@ -331,15 +390,16 @@ class TestSurveyEvaluator:
             has_critical_issues=True
         )
     
-    @pytest.mark.parametrize("scores,expected_overall", [
-        ({"coverage": 5, "coherence": 5, "structure": 5, "citations": 5, "insights": 5}, 5.0),
-        ({"coverage": 3, "coherence": 3, "structure": 3, "citations": 3, "insights": 3}, 3.0),
-        ({"coverage": 4, "coherence": 3, "structure": 5, "citations": 2, "insights": 4}, 3.55),
-    ])
-    def test_weighted_scoring(self, evaluator, scores, expected_overall):
+    def test_weighted_scoring(self, evaluator):
         """Test weighted score calculation"""
-        overall = evaluator.calculate_weighted_score(scores)
-        assert overall == pytest.approx(expected_overall, rel=1e-2)
+        cases = [
+            ({"coverage": 5, "coherence": 5, "structure": 5, "citations": 5, "insights": 5}, 5.0),
+            ({"coverage": 3, "coherence": 3, "structure": 3, "citations": 3, "insights": 3}, 3.0),
+            ({"coverage": 4, "coherence": 3, "structure": 5, "citations": 2, "insights": 4}, 3.55),
+        ]
+        got = np.array([evaluator.calculate_weighted_score(scores) for scores, _ in cases])
+        expected = np.array([overall for _, overall in cases])
+        np.testing.assert_allclose(got, expected, rtol=1e-2)
     
     def test_error_handling(self, evaluator):
         """Test error handling in evaluation"""
@@ -352,6 +412,177 @@ class TestSurveyEvaluator:
         assert result["overall"] < 2.0  # Should get low score
 
 
+class TestSurveyIndex:
+    """Test suite for the shared survey parse"""
+
+    @pytest.fixture
+    def survey(self):
+        """Survey mixing dict and object sections"""
+        section = Mock()
+        section.content = "However, results differ [Lee, 2023]. Short."
+        return {
+            "sections": [
+                {"content": "An overview of agent systems is given here [Smith, 2024]."},
+                section
+            ]
+        }
+
+    def test_build(self, survey):
+        """Index keeps per-section offsets, sentences and citations"""
+        index = SurveyIndex.build(survey)
+
+        assert index.section_count == 2
+        start, end = index.section_offsets[1]
+        assert index.full_text[start:end] == survey["sections"][1].content
+        assert index.sections_lower[1].startswith("however")
+        assert [g for _, g in index.citation_matches[0]] == [("Smith", "2024")]
+        assert [g for _, g in index.citation_matches[1]] == [("Lee", "2023")]
+        assert index.word_count == 16
+
+    def test_evaluators_accept_shared_index(self, survey):
+        """Passing a pre-built index gives the same metrics as building one"""
+        papers = [{"title": "Agents", "year": 2024}]
+        index = SurveyIndex.build(survey)
+
+        assert CitationEvaluator().evaluate_citations(survey, papers, index) == \
+            CitationEvaluator().evaluate_citations(survey, papers)
+        assert ContentEvaluator().evaluate_content(survey, papers, index) == \
+            ContentEvaluator().evaluate_content(survey, papers)
+
+
+class TestKeywordCounts:
+    """Test keyword counting agrees across the optional scanners"""
+
+    def test_backends_count_overlapping_phrases(self):
+        """Regex fallback, Aho-Corasick and Hyperscan all match per-phrase str.count"""
+        text = ("building on the other hand, this leads to a trend analysis. "
+                "as a result, in addition, trends in synthesis.")
+        index = SurveyIndex.build({"sections": [{"content": text}, {"content": text.upper()}]})
+        expected = tuple(
+            sum(section.count(phrase) for section in index.sections_lower for phrase in phrases)
+            for phrases in (TRANSITION_PHRASES, INSIGHT_KEYWORDS)
+        )
+        assert expected[0] >= 4
+
+        fallback = ContentEvaluator()
+        fallback._keyword_db = fallback._transition_ac = fallback._insight_ac = None
+        backends = [fallback]
+        if AHOCORASICK_AVAILABLE:
+            automaton = ContentEvaluator()
+            automaton._keyword_db = None
+            backends.append(automaton)
+        if HYPERSCAN_AVAILABLE:
+            backends.append(ContentEvaluator())
+
+        assert [tuple(b._keyword_counts(index)) for b in backends] == [expected] * len(backends)
+
+
+class TestSurveyComparator:
+    """Test suite for multi-method comparison"""
+
+    def test_parallel_matches_serial(self):
+        """Process-pool evaluation returns the same results as serial"""
+        surveys = {
+            "autosurvey": {"sections": [{"content": "An overview of methods [Smith, 2024]."}]},
+            "iterative": {"sections": [
+                {"content": "An overview of methods [Smith, 2024]. However, gaps remain."},
+                {"content": "In conclusion, future work is needed [Lee, 2023]."}
+            ], "total_iterations": 3, "converged": True}
+        }
+        papers = [{"title": "methods", "year": 2024}]
+        timing = {"iterative": (0.0, 2.0)}
+
+        serial = SurveyComparator(max_workers=1).compare_surveys(surveys, papers, timing)
+        parallel = SurveyComparator(max_workers=2).compare_surveys(surveys, papers, timing)
+
+        assert parallel == serial
+        assert serial["iterative"]["performance"]["time_seconds"] == 2.0
+        assert "improvement" in serial
+
+    def test_identical_surveys_evaluated_once(self):
+        """Repeated surveys reuse memoized results within and across calls"""
+        survey = {"sections": [{"content": "An overview of methods [Smith, 2024]."}]}
+        comparator = SurveyComparator(max_workers=1)
+
+        with patch.object(comparator.content_eval, "evaluate_content",
+                          wraps=comparator.content_eval.evaluate_content) as spy:
+            first = comparator.compare_surveys({"a": survey, "b": dict(survey)}, [])
+            second = comparator.compare_surveys({"c": survey}, [])
+
+        assert spy.call_count == 1
+        assert first["a"] == first["b"] == second["c"]
+        assert first["a"] is not first["b"]
+
+
+class TestSurveyEvaluatorBatch:
+    """Test suite for batched LLM content scoring"""
+
+    @pytest.fixture
+    def mock_wrapper(self):
+        """Mock wrapper answering with scores keyed by survey name"""
+        wrapper = Mock()
+        wrapper.chat_completion.return_value = (
+            'Scores:\n{"baseline": {"coverage": 3, "coherence": 3, "structure": 3, "insights": 3},\n'
+            ' "iterative": {"coverage": 4, "coherence": 5, "structure": 4, "insights": 4}}'
+        )
+        return wrapper
+
+    def test_single_call_for_all_surveys(self, mock_wrapper):
+        """All surveys are scored with one chat_completion call"""
+        evaluator = SurveyEvaluator(mock_wrapper)
+        surveys = {
+            "baseline": "Intro text about agents [1].",
+            "iterative": "Better intro text about agents [1]. More analysis [2]."
+        }
+
+        results = evaluator.evaluate_surveys(surveys, [])
+
+        assert mock_wrapper.chat_completion.call_count == 1
+        assert results["baseline"]["coverage"] == 3
+        assert results["iterative"]["coherence"] == 5
+        assert results["iterative"]["overall"] > results["baseline"]["overall"]
+
+    def test_precomputed_scores_skip_llm(self, mock_wrapper):
+        """evaluate_survey uses supplied content scores without calling the LLM"""
+        evaluator = SurveyEvaluator(mock_wrapper)
+        scores = {"coverage": 4, "coherence": 4, "structure": 4, "insights": 4}
+
+        result = evaluator.evaluate_survey("Some survey text.", [], content_scores=scores)
+
+        mock_wrapper.chat_completion.assert_not_called()
+        assert result["structure"] == 4
+
+    def test_rubric_sent_as_system_prompt(self, mock_wrapper):
+        """The static rubric is a system message shared by every judge call"""
+        evaluator = SurveyEvaluator(mock_wrapper)
+        evaluator.evaluate_surveys({"baseline": "a", "iterative": "b"}, [])
+
+        messages = mock_wrapper.chat_completion.call_args[0][0]
+        assert messages[0]["role"] == "system"
+        assert "Coverage" in messages[0]["content"]
+        assert "Coverage" not in messages[1]["content"]
+
+    def test_parses_wrapper_response_dict(self):
+        """OpenAI-style wrapper responses with trailing prose are parsed"""
+        wrapper = Mock()
+        wrapper.chat_completion.return_value = {"choices": [{"message": {"content": (
+            '{"coverage": 4, "coherence": 4, "structure": 3, "insights": 5} '
+            'Note: {see rubric}'
+        )}}]}
+
+        result = SurveyEvaluator(wrapper).evaluate_survey("Some survey text.", [])
+
+        assert result["coverage"] == 4
+        assert result["structure"] == 3
+
+    def test_missing_survey_scores_raise(self, mock_wrapper):
+        """A batch response lacking a requested survey is rejected"""
+        evaluator = SurveyEvaluator(mock_wrapper)
+
+        with pytest.raises(ValueError):
+            evaluator.evaluate_surveys({"baseline": "a", "lce": "b"}, [])
+
+
 @pytest.mark.integration
 class TestMetricsIntegration:
     """Integration tests for metrics system"""
@@ -365,12 +596,12 @@ class TestMetricsIntegration:
             "sections": [
                 {
                     "title": "Introduction",
-                    "content": "This is a comprehensive introduction to the topic. " * 20,
+                    "content": _PIPELINE_INTRO_BLOB,
                     "citations": ["Ref1", "Ref2"]
                 },
                 {
                     "title": "Methods",
-                    "content": "We describe our methodology in detail. " * 30,
+                    "content": _PIPELINE_METHODS_BLOB,
                     "citations": ["Ref3", "Ref4", "Ref5"]
                 }
             ]
@@ -385,23 +616,21 @@ class TestMetricsIntegration:
             {"title": "Uncited", "abstract": "Not cited"}
         ]
         
-        # Mock the Claude wrapper
-        with patch.object(evaluator, 'claude_wrapper') as mock_wrapper:
-            mock_wrapper.query.return_value = {
-                "coverage": 4.2,
-                "coherence": 4.0,
-                "structure": 4.1,
-                "citations": 4.3,
-                "insights": 3.9
-            }
-            
-            result = evaluator.evaluate(survey, papers)
+        # Stub the Claude wrapper; this evaluator is local to the test
+        evaluator.claude_wrapper = _StubWrapper({
+            "coverage": 4.2,
+            "coherence": 4.0,
+            "structure": 4.1,
+            "citations": 4.3,
+            "insights": 3.9
+        })
+        result = evaluator.evaluate(survey, papers)
         
         assert result["overall"] >= 3.5
         assert result["citation_metrics"]["recall"] >= 0.8
         assert len(result["feedback"]) > 0
     
-    def test_iterative_improvement_tracking(self):
+    def test_iterative_improvement_tracking(self, fake_clock):
         """Test tracking improvements across iterations"""
         performance = PerformanceMetrics()
         evaluator = SurveyEvaluator()
@@ -412,8 +641,7 @@ class TestMetricsIntegration:
         for i, score in enumerate(iteration_scores):
             performance.start_iteration(i)
             # Simulate some work
-            import time
-            time.sleep(0.01)
+            fake_clock[0] += 0.01
             performance.end_iteration(i, quality_score=score)
         
         # Check convergence
@@ -431,4 +659,7 @@ class TestMetricsIntegration:
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    args = [__file__, "-v", "-m", "not integration"]
+    if importlib.util.find_spec("xdist") is not None:
+        args += ["-n", "auto"]
+    pytest.main(args)
\ No newline at end of file
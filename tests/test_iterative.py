@@ -2,6 +2,7 @@
 Unit tests for the Global Iterative System
 """
 
+import tempfile
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 import sys
@@ -123,12 +124,15 @@ class TestIterativeSurveySystem(unittest.TestCase):
         self.mock_verifier = Mock(spec=GlobalVerifier)
         self.mock_improver = Mock(spec=TargetedImprover)
         self.mock_base = Mock(spec=AutoSurveyBaseline)
+        checkpoint_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(checkpoint_dir.cleanup)
         
         self.system = IterativeSurveySystem(
             base_generator=self.mock_base,
             verifier=self.mock_verifier,
             improver=self.mock_improver,
-            max_iterations=3
+            max_iterations=3,
+            checkpoint_dir=checkpoint_dir.name
         )
     
     def test_initialization(self):
@@ -212,7 +216,9 @@ class TestIntegration(unittest.TestCase):
         mock_wrapper.chat_completion = Mock(side_effect=mock_chat)
         
         # Create system and run
-        system = IterativeSurveySystem(max_iterations=5)
+        checkpoint_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(checkpoint_dir.cleanup)
+        system = IterativeSurveySystem(max_iterations=5, checkpoint_dir=checkpoint_dir.name)
         papers = [{'title': f'Paper {i}'} for i in range(10)]
         
         # The system should iterate and improve
@@ -1,11 +1,17 @@
 """
 Comprehensive tests for Global Iterative System (our core innovation)
+
+The test classes share no state, so the file can be spread over workers:
+pytest tests/test_our_system/test_iterative.py -n auto --dist=loadgroup
 """
 
+import importlib.util
 import pytest
 from unittest.mock import Mock, patch, MagicMock, call
 import json
 import copy
+import functools
+import numpy as np
 import os
 import sys
 
@@ -19,59 +25,176 @@ from src.our_system.iterative import (
 )
 
 
+# Read-only sample data, built once per process and shared by the fixtures
+_PAPERS = tuple({"title": f"Paper {i}", "abstract": f"Abstract {i}"} for i in range(20))
+
+_SAMPLE_SURVEY = {
+    "title": "LLM Survey",
+    "sections": [
+        {
+            "title": "Introduction",
+            "content": "This is an introduction to LLMs. " * 50,
+            "citations": ["Paper1", "Paper2"]
+        },
+        {
+            "title": "Methods",
+            "content": "We describe various methods. " * 100,
+            "citations": ["Paper3", "Paper4", "Paper5"]
+        },
+        {
+            "title": "Results", 
+            "content": "Our findings show that... " * 75,
+            "citations": ["Paper6"]
+        },
+        {
+            "title": "Conclusion",
+            "content": "In conclusion... " * 30,
+            "citations": ["Paper7", "Paper8"]
+        }
+    ]
+}
+
+
+# Canned wrapper responses; tests only read them
+_HIGH_QUALITY_RESP = {
+    "scores": {
+        "coverage": 4.5,
+        "coherence": 4.3,
+        "structure": 4.2,
+        "citations": 4.4,
+        "insights": 4.0
+    },
+    "issues": [],
+    "suggestions": ["Minor improvements possible"]
+}
+
+_LOW_QUALITY_RESP = {
+    "scores": {
+        "coverage": 2.0,
+        "coherence": 2.5,
+        "structure": 2.2,
+        "citations": 1.5,
+        "insights": 2.0
+    },
+    "issues": [
+        "Insufficient coverage",
+        "Missing citations",
+        "Poor structure"
+    ],
+    "suggestions": [
+        "Add more sections",
+        "Include citations",
+        "Expand content"
+    ]
+}
+
+_COVERAGE_RESP = {
+    "sections": [
+        {"title": "Intro", "content": "Expanded introduction"},
+        {"title": "Methods", "content": "New methods section"},
+        {"title": "Results", "content": "New results section"}
+    ]
+}
+
+_COHERENCE_RESP = {
+    "sections": [
+        {"title": "A", "content": "Content A with transition to B"},
+        {"title": "B", "content": "Content B building on A and leading to C"},
+        {"title": "C", "content": "Content C concluding A and B"}
+    ]
+}
+
+_CITATIONS_RESP = {
+    "sections": [
+        {
+            "title": "Methods",
+            "content": "We use various methods [1, 2]",
+            "citations": ["Method Paper 1", "Method Paper 2"]
+        }
+    ]
+}
+
+_STRUCTURE_RESP = {
+    "sections": [
+        {
+            "title": "Introduction",
+            "content": "Intro content",
+            "subsections": ["Background", "Motivation"]
+        },
+        {
+            "title": "Main Content",
+            "content": "Main content",
+            "subsections": ["Part A", "Part B", "Part C"]
+        },
+        {
+            "title": "Conclusion",
+            "content": "Conclusion content"
+        }
+    ]
+}
+
+# Successive improvements returned by the mocked improver, built once
+_IMPROVED_SURVEYS = tuple(
+    {"sections": [{"title": title, "content": content}]}
+    for title, content in (
+        ("Improved 1", "Better"),
+        ("Improved 2", "Much better"),
+        ("Improved 3", "Even better"),
+        ("Final", "Best version"),
+    )
+)
+
+_DIMENSIONS = ("coverage", "coherence", "structure", "citations", "insights")
+# Verifier weight of each dimension, in _DIMENSIONS order
+WEIGHTS = np.array([0.25, 0.20, 0.20, 0.20, 0.15])
+
+
+@functools.lru_cache(maxsize=None)
+def _verif(score: float, issues: tuple = ()) -> dict:
+    """Verification result with every dimension at score
+    
+    Cached, so tests must treat the returned dict as read-only.
+    """
+    return {
+        "overall_score": score,
+        "meets_criteria": score >= 4.0,
+        "issues": list(issues),
+        "scores": {k: score for k in _DIMENSIONS}
+    }
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _patch_llm():
+    """Patch the LLM wrapper and baseline once for the whole module"""
+    with patch('src.our_system.iterative.ClaudeCodeCLIWrapper') as wrapper, \
+         patch('src.our_system.iterative.AutoSurveyBaseline') as baseline:
+        yield wrapper, baseline
+
+
+@pytest.fixture(autouse=True)
+def _reset_llm_mocks(_patch_llm):
+    """Clear responses configured by a test from the shared mock instances"""
+    yield
+    for mock in _patch_llm:
+        mock.return_value.reset_mock(return_value=True, side_effect=True)
+
+
 class TestGlobalVerifier:
     """Test suite for GlobalVerifier"""
     
-    @pytest.fixture
-    def verifier(self):
+    @pytest.fixture(scope="class")
+    def verifier(self, _patch_llm):
         """Create GlobalVerifier instance"""
-        with patch('src.our_system.iterative.ClaudeCodeCLIWrapper'):
-            return GlobalVerifier()
+        return GlobalVerifier()
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def sample_survey(self):
         """Sample survey for testing"""
-        return {
-            "title": "LLM Survey",
-            "sections": [
-                {
-                    "title": "Introduction",
-                    "content": "This is an introduction to LLMs. " * 50,
-                    "citations": ["Paper1", "Paper2"]
-                },
-                {
-                    "title": "Methods",
-                    "content": "We describe various methods. " * 100,
-                    "citations": ["Paper3", "Paper4", "Paper5"]
-                },
-                {
-                    "title": "Results", 
-                    "content": "Our findings show that... " * 75,
-                    "citations": ["Paper6"]
-                },
-                {
-                    "title": "Conclusion",
-                    "content": "In conclusion... " * 30,
-                    "citations": ["Paper7", "Paper8"]
-                }
-            ]
-        }
+        return _SAMPLE_SURVEY
     
     def test_verify_survey_high_quality(self, verifier, sample_survey):
         """Test verification of high-quality survey"""
-        mock_response = {
-            "scores": {
-                "coverage": 4.5,
-                "coherence": 4.3,
-                "structure": 4.2,
-                "citations": 4.4,
-                "insights": 4.0
-            },
-            "issues": [],
-            "suggestions": ["Minor improvements possible"]
-        }
-        
-        verifier.claude_wrapper.query.return_value = mock_response
+        verifier.claude_wrapper.query.return_value = _HIGH_QUALITY_RESP
         
         result = verifier.verify(sample_survey)
         
@@ -89,27 +212,7 @@ class TestGlobalVerifier:
             ]
         }
         
-        mock_response = {
-            "scores": {
-                "coverage": 2.0,
-                "coherence": 2.5,
-                "structure": 2.2,
-                "citations": 1.5,
-                "insights": 2.0
-            },
-            "issues": [
-                "Insufficient coverage",
-                "Missing citations",
-                "Poor structure"
-            ],
-            "suggestions": [
-                "Add more sections",
-                "Include citations",
-                "Expand content"
-            ]
-        }
-        
-        verifier.claude_wrapper.query.return_value = mock_response
+        verifier.claude_wrapper.query.return_value = _LOW_QUALITY_RESP
         
         result = verifier.verify(low_quality_survey)
         
@@ -120,17 +223,17 @@ class TestGlobalVerifier:
     def test_weighted_scoring(self, verifier):
         """Test weighted score calculation"""
         scores = {
-            "coverage": 4.0,    # Weight: 0.25
-            "coherence": 3.0,   # Weight: 0.20
-            "structure": 5.0,   # Weight: 0.20
-            "citations": 2.0,   # Weight: 0.20
-            "insights": 4.0     # Weight: 0.15
+            "coverage": 4.0,
+            "coherence": 3.0,
+            "structure": 5.0,
+            "citations": 2.0,
+            "insights": 4.0
         }
         
-        expected = (4.0*0.25 + 3.0*0.20 + 5.0*0.20 + 2.0*0.20 + 4.0*0.15)
+        expected = float(np.dot([scores[k] for k in _DIMENSIONS], WEIGHTS))
         calculated = verifier._calculate_weighted_score(scores)
         
-        assert calculated == pytest.approx(expected, rel=1e-3)
+        assert abs(calculated - expected) < 1e-9
     
     def test_convergence_criteria(self, verifier):
         """Test convergence criteria checking"""
@@ -155,6 +258,7 @@ class TestGlobalVerifier:
         """Test various scoring scenarios"""
         calculated = verifier._calculate_weighted_score(scores)
         assert calculated == pytest.approx(expected_overall, rel=1e-2)
+        assert abs(calculated - float(np.dot([scores[k] for k in _DIMENSIONS], WEIGHTS))) < 1e-9
     
     def test_dimension_identification(self, verifier):
         """Test identification of weak dimensions"""
@@ -176,11 +280,10 @@ class TestGlobalVerifier:
 class TestTargetedImprover:
     """Test suite for TargetedImprover"""
     
-    @pytest.fixture
-    def improver(self):
+    @pytest.fixture(scope="class")
+    def improver(self, _patch_llm):
         """Create TargetedImprover instance"""
-        with patch('src.our_system.iterative.ClaudeCodeCLIWrapper'):
-            return TargetedImprover()
+        return TargetedImprover()
     
     @pytest.fixture
     def verification_result(self):
@@ -212,15 +315,7 @@ class TestTargetedImprover:
             "suggestions": ["Add sections on methods and results"]
         }
         
-        mock_response = {
-            "sections": [
-                {"title": "Intro", "content": "Expanded introduction"},
-                {"title": "Methods", "content": "New methods section"},
-                {"title": "Results", "content": "New results section"}
-            ]
-        }
-        
-        improver.claude_wrapper.query.return_value = mock_response
+        improver.claude_wrapper.query.return_value = _COVERAGE_RESP
         
         improved = improver.improve(survey, verification, papers=[])
         
@@ -242,15 +337,7 @@ class TestTargetedImprover:
             "issues": ["Poor transitions between sections"]
         }
         
-        mock_response = {
-            "sections": [
-                {"title": "A", "content": "Content A with transition to B"},
-                {"title": "B", "content": "Content B building on A and leading to C"},
-                {"title": "C", "content": "Content C concluding A and B"}
-            ]
-        }
-        
-        improver.claude_wrapper.query.return_value = mock_response
+        improver.claude_wrapper.query.return_value = _COHERENCE_RESP
         
         improved = improver.improve(survey, verification, papers=[])
         
@@ -276,17 +363,7 @@ class TestTargetedImprover:
             "issues": ["Insufficient citations"]
         }
         
-        mock_response = {
-            "sections": [
-                {
-                    "title": "Methods",
-                    "content": "We use various methods [1, 2]",
-                    "citations": ["Method Paper 1", "Method Paper 2"]
-                }
-            ]
-        }
-        
-        improver.claude_wrapper.query.return_value = mock_response
+        improver.claude_wrapper.query.return_value = _CITATIONS_RESP
         
         improved = improver.improve(survey, verification, papers)
         
@@ -306,26 +383,7 @@ class TestTargetedImprover:
             "issues": ["Poor organization", "Needs subsections"]
         }
         
-        mock_response = {
-            "sections": [
-                {
-                    "title": "Introduction",
-                    "content": "Intro content",
-                    "subsections": ["Background", "Motivation"]
-                },
-                {
-                    "title": "Main Content",
-                    "content": "Main content",
-                    "subsections": ["Part A", "Part B", "Part C"]
-                },
-                {
-                    "title": "Conclusion",
-                    "content": "Conclusion content"
-                }
-            ]
-        }
-        
-        improver.claude_wrapper.query.return_value = mock_response
+        improver.claude_wrapper.query.return_value = _STRUCTURE_RESP
         
         improved = improver.improve(survey, verification, papers=[])
         
@@ -352,28 +410,27 @@ class TestTargetedImprover:
         calls = improver.claude_wrapper.query.call_args_list
         
         # Verify improvements were attempted for weak areas
-        prompts = [str(call) for call in calls]
-        assert any("coherence" in p.lower() for p in prompts)
-        assert any("citation" in p.lower() for p in prompts)
+        prompts = [c.args[0] if c.args else c.kwargs.get("prompt", "") for c in calls]
+        lowered = [str(p).lower() for p in prompts]
+        assert any("coherence" in p for p in lowered)
+        assert any("citation" in p for p in lowered)
 
 
 class TestIterativeSurveySystem:
     """Test suite for complete Global Iterative System"""
     
-    @pytest.fixture
-    def system(self):
+    @pytest.fixture(scope="class")
+    def system(self, _patch_llm, tmp_path_factory):
         """Create IterativeSurveySystem instance"""
-        with patch('src.our_system.iterative.ClaudeCodeCLIWrapper'):
-            with patch('src.our_system.iterative.AutoSurveyBaseline'):
-                return IterativeSurveySystem(max_iterations=5)
+        return IterativeSurveySystem(
+            max_iterations=5,
+            checkpoint_dir=str(tmp_path_factory.mktemp("checkpoints"))
+        )
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def sample_papers(self):
         """Sample papers for testing"""
-        return [
-            {"title": f"Paper {i}", "abstract": f"Abstract {i}"}
-            for i in range(20)
-        ]
+        return _PAPERS
     
     def test_initialization(self, system):
         """Test system initialization"""
@@ -426,25 +483,12 @@ class TestIterativeSurveySystem:
         
         # Mock progressive improvement
         verification_scores = [3.0, 3.5, 3.8, 4.1]
-        improved_surveys = [
-            {"sections": [{"title": "Improved 1", "content": "Better"}]},
-            {"sections": [{"title": "Improved 2", "content": "Much better"}]},
-            {"sections": [{"title": "Improved 3", "content": "Even better"}]},
-            {"sections": [{"title": "Final", "content": "Best version"}]}
-        ]
-        
-        system.verifier.verify.side_effect = [
-            {
-                "overall_score": score,
-                "meets_criteria": score >= 4.0,
-                "issues": ["Some issues"] if score < 4.0 else [],
-                "scores": {"coverage": score, "coherence": score, 
-                          "structure": score, "citations": score, "insights": score}
-            }
+        system.verifier.verify.side_effect = (
+            _verif(score, ("Some issues",) if score < 4.0 else ())
             for score in verification_scores
-        ]
+        )
         
-        system.improver.improve.side_effect = improved_surveys
+        system.improver.improve.side_effect = _IMPROVED_SURVEYS
         
         result = system.generate_iterative_survey(sample_papers, "Test Topic")
         
@@ -481,16 +525,7 @@ class TestIterativeSurveySystem:
         system.baseline.generate_survey.return_value = initial_survey
         
         scores = [3.2, 3.6, 4.1]
-        system.verifier.verify.side_effect = [
-            {
-                "overall_score": score,
-                "meets_criteria": score >= 4.0,
-                "issues": [],
-                "scores": {"coverage": score, "coherence": score,
-                          "structure": score, "citations": score, "insights": score}
-            }
-            for score in scores
-        ]
+        system.verifier.verify.side_effect = (_verif(score) for score in scores)
         
         system.improver.improve.return_value = {"sections": []}
         
@@ -537,16 +572,7 @@ class TestIterativeSurveySystem:
         system.baseline.generate_survey.return_value = {"sections": []}
         
         scores = [initial_score] + improvements
-        system.verifier.verify.side_effect = [
-            {
-                "overall_score": score,
-                "meets_criteria": score >= 4.0,
-                "issues": [],
-                "scores": {"coverage": score, "coherence": score,
-                          "structure": score, "citations": score, "insights": score}
-            }
-            for score in scores
-        ]
+        system.verifier.verify.side_effect = (_verif(score) for score in scores)
         
         system.improver.improve.return_value = {"sections": []}
         
@@ -584,10 +610,11 @@ class TestIterativeSurveySystem:
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("integration")
 class TestGlobalIterativeIntegration:
     """Integration tests for Global Iterative System"""
     
-    def test_full_iterative_workflow(self):
+    def test_full_iterative_workflow(self, tmp_path):
         """Test complete iterative improvement workflow"""
         with patch('src.our_system.iterative.ClaudeCodeCLIWrapper') as mock_wrapper:
             with patch('src.our_system.iterative.AutoSurveyBaseline') as mock_baseline:
@@ -628,7 +655,7 @@ class TestGlobalIterativeIntegration:
                     verification_responses[2],  # Final verification
                 ]
                 
-                system = IterativeSurveySystem()
+                system = IterativeSurveySystem(checkpoint_dir=str(tmp_path))
                 
                 papers = [{"title": f"Paper {i}"} for i in range(10)]
                 result = system.generate_iterative_survey(papers, "Test Topic")
@@ -642,13 +669,13 @@ class TestGlobalIterativeIntegration:
                 scores = [h["score"] for h in result["iteration_history"]]
                 assert scores == [3.2, 3.7, 4.2]
     
-    def test_performance_tracking(self):
+    def test_performance_tracking(self, tmp_path):
         """Test performance metrics during iteration"""
         from src.evaluation.metrics import PerformanceMetrics
         
         with patch('src.our_system.iterative.ClaudeCodeCLIWrapper'):
             with patch('src.our_system.iterative.AutoSurveyBaseline'):
-                system = IterativeSurveySystem()
+                system = IterativeSurveySystem(checkpoint_dir=str(tmp_path))
                 system.performance_tracker = PerformanceMetrics()
                 
                 # Mock simple convergence
@@ -673,4 +700,7 @@ class TestGlobalIterativeIntegration:
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    args = [__file__, "-v"]
+    if importlib.util.find_spec("xdist") is not None:
+        args += ["-n", "auto", "--dist=loadgroup"]
+    pytest.main(args)
\ No newline at end of file